@@ -19,6 +19,7 @@ setup(
     packages=find_packages(include=["uhb"]),
     entry_points={"console_scripts": ["uhb=uhb.cli:main"]},
     install_requires=open("requirements.txt").readlines(),
+    python_requires=">=3.7",
     include_package_data=True,
     license="MIT License",
     zip_safe=False,
@@ -30,6 +31,10 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.7",
+        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
     ],
 )
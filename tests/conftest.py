@@ -0,0 +1,14 @@
+"""Shared fixtures."""
+
+import pytest
+
+from uhb import cli
+
+from .test_analytical import data_inputs
+
+
+@pytest.fixture
+def data():
+    # The material strengths of data.json, which only some modules need
+    return cli.convert(dict(
+        data_inputs, SMYS=415e6, SMYS_e=0.005, SMTS=520e6, SMTS_e=0.215))
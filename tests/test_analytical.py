@@ -1,14 +1,67 @@
 """Tests for analytical module."""
 
+import numpy as np
 import pytest
 from . import tol_check
 
-from uhb import analytical
+from uhb import analytical, cli, instrument
 
 test_inputs = {"D": 0.1683, "t": 0.011, "t_coat": 0.0024}
 
+data_inputs = {
+    "D": 0.1683, "t": 0.011, "t_coat": 0.0024, "P_i": 190e5, "P_e": 0,
+    "T": 50, "T_a": 0, "rho_p": 7850, "rho_coat": 900, "rho_cont": 0,
+    "v": 0.3, "alpha": 1.17e-5, "E": 207e9, "deltas": [0.1, 0.5],
+    "soil_type": "dense sand", "gamma_s": 18000, "psi_s": 32, "c": 0,
+    "f": 0.36, "rho_sw": 1025, "g": 9.81,
+}
+
 
 def test_required_download():
     assert tol_check(
         analytical.required_download(0.5, 207e9, 1.689e-5, 786019, 193.34), 3873
     )
+
+
+def test_required_sand_cover_height_vectorised():
+    q = np.array([0, 3680.0859, 3680.0859])
+    c = np.array([0, 0, 5000])
+    H = analytical.required_sand_cover_height(q, 0.1731, 18000, 0.36, c)
+    assert H[0] == pytest.approx(0, abs=1e-9)
+    assert tol_check(H[1], 0.5506)
+    assert tol_check(H[2], 3680.0859 / (18000 * 0.1731 + 2 * 5000))
+
+
+def test_cover_height_sensitivities():
+    data = cli.convert(data_inputs)
+    H, dH = analytical.cover_height_sensitivities(data, names=("T", "delta"))
+    assert tol_check(H, 0.5506)
+    for name, step in (("T", 1e-4), ("delta", 1e-7)):
+        if name == "delta":
+            perturbed = data._replace(deltas=[max(data.deltas) + step])
+        else:
+            perturbed = data._replace(T=data.T + step)
+        H_step = analytical.run_analytical_calc(perturbed).H
+        assert tol_check(dH[name], (H_step - H) / step)
+
+
+def test_required_sand_cover_height_failures():
+    instrument.reset()
+    instrument.enable()
+    try:
+        H = analytical.required_sand_cover_height(
+            3000, 0.1731, np.array([18000, -18000]), 0.5, 0)
+        counters = instrument.report()["counters"]
+    finally:
+        instrument.disable()
+        instrument.reset()
+    assert H[0] > 0 and np.isnan(H[1])
+    assert counters["analytical.cover_solve.failures"] == 1
+
+
+def test_required_sand_cover_height_all_failed():
+    H = analytical.required_sand_cover_height(
+        3000, 0.1731, np.array([-18000, -18000]), 0.5, 0)
+    assert np.all(np.isnan(H))
+    with pytest.raises(RuntimeError):
+        analytical.required_sand_cover_height(3000, 0.1731, -18000, 0.5, 0)
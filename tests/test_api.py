@@ -0,0 +1,80 @@
+"""Tests for api module."""
+
+import asyncio
+import json
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from uhb import analytical, api, cli, psi
+
+from .test_analytical import data_inputs
+
+
+def test_as_data(tmpdir):
+    path = str(tmpdir.join("data.json"))
+    with open(path, "w") as outfile:
+        json.dump(data_inputs, outfile)
+    data = cli.convert(data_inputs)
+    assert api.as_data(path) == api.as_data(data_inputs) == data
+    assert api.as_data(data) is data
+
+
+def test_analytical():
+    expected = analytical.run_analytical_calc(cli.convert(data_inputs))
+    assert pytest.approx(api.analytical(data_inputs)["H"]) == expected.H
+
+
+def test_springs_unknown_model():
+    with pytest.raises(ValueError):
+        api.springs(data_inputs, 1.0, {"uplift": "none"})
+
+
+def test_springs():
+    result = api.springs(data_inputs, 1.0, {"uplift": "f110"})
+    expected = psi.gen_uplift_spring(cli.convert(data_inputs), 1.0, "f110")
+    assert (result["uplift"]["disp"], result["uplift"]["resistance"]) == \
+        expected
+
+
+def test_map_async_threads():
+    batch = [dict(data_inputs, T=T) for T in (30, 40, 50)]
+
+    async def run():
+        with ThreadPoolExecutor(3) as executor:
+            return await api.map_async(api.analytical, batch,
+                                       executor=executor)
+
+    results = asyncio.run(run())
+    assert [r["H"] for r in results] == [api.analytical(d)["H"] for d in batch]
+
+
+def test_analytical_threads():
+    # Cover solves that fail to converge exercise the nan path as well
+    batch = [dict(data_inputs, T=T) for T in range(20, 84, 2)] + [
+        dict(data_inputs, gamma_s=np.array([18000.0, -18000.0]))] * 8
+    filters = list(warnings.filters)
+
+    def run(inputs):
+        return api.analytical(inputs)["H"], list(warnings.filters)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(run, batch))
+    for (H, seen), inputs in zip(results, batch):
+        np.testing.assert_array_equal(H, api.analytical(inputs)["H"])
+        assert seen == filters
+    assert warnings.filters == filters
+
+
+def test_load_cases_async_processes():
+    states = [{"name": "operating", "rho_cont": 0, "P_i": 190e5, "T": 50}]
+
+    async def run():
+        with ProcessPoolExecutor(1) as executor:
+            return await api.load_cases_async(data_inputs, states, executor)
+
+    result = asyncio.run(run())
+    assert result["names"] == ["operating"]
+    assert pytest.approx(result["H"][0]) == api.analytical(data_inputs)["H"]
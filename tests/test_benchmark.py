@@ -0,0 +1,43 @@
+"""Tests for benchmark module."""
+
+import pytest
+
+from uhb import benchmark
+
+
+def test_run_benchmarks(data):
+    results = benchmark.run_benchmarks(
+        data, sizes=(1, 10), names=["psi.Tu", "psi.Qu"], repeat=1)
+    assert set(results["results"]) == {"psi.Tu", "psi.Qu"}
+    assert results["results"]["psi.Tu"]["10"]["mode"] == "vector"
+    assert results["results"]["psi.Qu"]["1"]["mode"] == "scalar"
+
+
+def test_looped_batch_skipped_over_budget(data):
+    timing = benchmark.time_case(
+        benchmark.CASES["ramberg.ramberg_osgood"], data, 10 ** 7, budget=1,
+        estimate=1e-3)
+    assert timing["mode"] == "skipped"
+    assert pytest.approx(timing["estimate"]) == 1e4
+
+
+def test_scaling_exponent():
+    assert pytest.approx(benchmark.scaling_exponent(10, 1, 1000, 100)) == 1
+
+
+@pytest.mark.parametrize(
+    "seconds, expected", [(1.2, []), (1.5, [("psi.Qu", "1", 1.5)])]
+)
+def test_compare(seconds, expected):
+    baseline = {"results": {"psi.Qu": {"1": {"seconds": 1.0}}}}
+    current = {"results": {"psi.Qu": {"1": {"seconds": seconds}}}}
+    assert benchmark.compare(current, baseline, threshold=0.25) == expected
+
+
+def test_compare_warns_on_meta_mismatch():
+    baseline = {"meta": {"numpy": "1.17.0"},
+                "results": {"psi.Qu": {"1": {"seconds": 1.0}}}}
+    current = {"meta": {"numpy": "1.26.0"},
+               "results": {"psi.Qu": {"1": {"seconds": 1.0}}}}
+    with pytest.warns(UserWarning, match="numpy"):
+        assert benchmark.compare(current, baseline) == []
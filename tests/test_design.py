@@ -0,0 +1,74 @@
+"""Tests for design module."""
+
+import numpy as np
+import pytest
+
+from uhb import analytical, cli, design, psi, reliability
+
+
+def test_bisect():
+    root = design.bisect(lambda x: x ** 2 - [2, 9], [0, 0], [2, 4], tol=1e-9)
+    assert pytest.approx(root) == [2 ** 0.5, 3]
+
+
+def test_minimum_coating_thickness(data):
+    data = data._replace(rho_coat=3040)
+    H = np.array([0.3, 0.5, 1.0])
+    result = design.minimum_coating_thickness(data, H)
+    assert result.feasible.all()
+    assert result.value[2] == 0
+    required = analytical.run_analytical_calc(
+        data._replace(t_coat=result.value[:2])).H
+    assert pytest.approx(required, 1e-4) == H[:2]
+
+
+def test_minimum_coating_thickness_infeasible(data):
+    result = design.minimum_coating_thickness(
+        data._replace(rho_coat=3040), np.array([0.01, 0.5]), hi=0.1)
+    assert list(result.feasible) == [False, True]
+    assert np.isnan(result.value[0])
+
+
+def test_minimum_wall_thickness(data):
+    data = cli.convert(dict(data._asdict(), SMYS=415e6))
+    bound = design.buoyancy_thickness(data)
+    assert bound > design.hoop_thickness(data)
+    assert pytest.approx(design.specific_gravity(data._replace(t=bound))) \
+        == 1.1
+    required = analytical.run_analytical_calc(data._replace(t=bound)).H
+    H = np.array([required - 0.05, required + 0.05, 1.0])
+    result = design.minimum_wall_thickness(data, H)
+    assert list(result.feasible) == [False, True, True]
+    assert pytest.approx(result.value[1:]) == [bound, bound]
+
+
+def test_minimum_input_narrow_window(data):
+    # Only sections just heavier than buoyant need little enough download
+    H = np.array([0.2, 0.5])
+    result = design.minimum_input(data, H, "t", 0.001, data.D / 4)
+    assert result.feasible.all()
+    margin = reliability.limit_state(data._replace(t=result.value), H)
+    assert np.all(margin >= 0)
+
+
+def test_layered_cover_resistance():
+    assert pytest.approx(design.layered_cover_resistance(
+        0.8, 0, 0.17, 18000, 0.5, 11000, 0.6)) == psi.R_max(
+        0.8, 0.17, 18000, 0.5)
+
+
+def test_rock_dump_height(data):
+    H = np.array([0.1, 0.3, 1.0])
+    result = design.rock_dump_height(data, H, 11000, 0.6)
+    assert result.feasible.all()
+    assert result.value[2] == 0
+    download = analytical.stability_download(data)
+    resistance = design.layered_cover_resistance(
+        H[:2], result.value[:2], download.D_tot, data.gamma_s, data.f,
+        11000, 0.6)
+    assert pytest.approx(resistance, 1e-4) == download.w - download.w_o
+
+
+def test_rock_dump_height_cohesive(data):
+    with pytest.raises(ValueError):
+        design.rock_dump_height(data._replace(c=5000), 0.5, 11000, 0.6)
@@ -0,0 +1,40 @@
+"""Tests for dual module."""
+
+import numpy as np
+import pytest
+
+from uhb import dual, psi
+
+
+def test_arithmetic():
+    x = dual.seed({"x": 2.0})["x"]
+    y = (3 * x ** 2 - x / 4 + 1) / x
+    # y = 3x - 1/4 + 1/x, dy/dx = 3 - 1/x^2
+    assert pytest.approx(y.der[0]) == 3 - 1 / 4
+
+
+def test_ufuncs_and_where():
+    x = dual.seed({"x": np.array([0.5, 2.0])})["x"]
+    y = np.where(x > 1, np.exp(x), np.sin(x))
+    assert pytest.approx(y.der[0]) == [np.cos(0.5), np.exp(2.0)]
+
+
+@pytest.mark.parametrize("x, expected", [(22.5, 0.4), (10, 0), (60, 0)])
+def test_interp(x, expected):
+    x = dual.seed({"x": x})["x"]
+    assert pytest.approx(np.interp(x, [20, 25, 30], [1, 3, 4]).der[0]) == expected
+
+
+def test_psi_kernel_derivative():
+    seeded = dual.seed({"psi": 32.0, "H": 1.087})
+    Pu = psi.Pu(0, seeded["H"], 0.1731, seeded["psi"], 18000)
+    h = 1e-6
+    dPu_dH = (psi.Pu(0, 1.087 + h, 0.1731, 32, 18000) - Pu.val) / h
+    assert pytest.approx(Pu.der[1], 1e-4) == dPu_dH
+
+
+def test_implicit():
+    # root of x^2 - a = 0 is sqrt(a), dx/da = 1 / (2 sqrt(a))
+    a = dual.seed({"a": 4.0})["a"]
+    root = dual.implicit(lambda x, a: x ** 2 - a, 2.0, a)
+    assert pytest.approx(root.der[0]) == 0.25
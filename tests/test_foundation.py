@@ -3,3 +3,10 @@
 import pytest
 
 from uhb import foundation
+
+
+def test_main_directory(tmpdir):
+    pipe = {"E": 2.07e11, "I": 1.6895e-05, "W_sub": 193.34, "gamma_factor": 1}
+    foundation.main(0.3, pipe, plot=False, directory=str(tmpdir))
+    assert len(tmpdir.listdir()) == 5
+    assert tmpdir.join("foundation_profile_0.5m.txt").check()
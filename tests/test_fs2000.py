@@ -0,0 +1,90 @@
+"""Tests for fs2000 module."""
+
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from uhb import cli, fs2000
+
+from .test_analytical import data_inputs
+
+DECKS = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), os.pardir, "fs2000"))
+
+
+@pytest.fixture
+def config():
+    return fs2000.load_config(os.path.join(DECKS, "config.json"))
+
+
+def test_parse_deck():
+    deck = fs2000.parse_deck(os.path.join(DECKS, "KRAKEN.UMUHB_1000"))
+    assert deck.cover == 1.0
+    assert sorted(deck.tables) == list(range(1, 11))
+    assert deck.tables[1] == [
+        (0.02, 5400.0), (1.0, -3116.0), (100.0, -3116.0)]
+
+
+def test_parse_deck_inputs():
+    inputs = fs2000.parse_deck(os.path.join(DECKS, "KRAKEN.UMUHB")).inputs
+    assert inputs["D"] == 0.1683
+    assert inputs["t"] == 0.011
+    assert inputs["t_coat"] == 0.0024
+    assert inputs["SMYS"] == 448.1e6
+
+
+def test_compare_deck(data, config):
+    pipe = fs2000.parse_deck(os.path.join(DECKS, "KRAKEN.UMUHB")).inputs
+    rows = fs2000.compare_deck(os.path.join(DECKS, "KRAKEN.UMUHB_1000"), data,
+                               config, pipe_inputs=pipe)
+    assert len(rows) == 10
+    uplift = [row for row in rows if row.direction == "uplift"]
+    assert all(row.curve_diff < 1e-3 for row in uplift)
+    lateral = [row for row in rows if row.direction == "lateral"]
+    assert all(abs(row.force_diff) < 1e-3 for row in lateral)
+    # The deck table 6 is a tenth of the 0.3 m element bearing resistance
+    assert rows[5].fs2000_force / rows[5].uhb_force == pytest.approx(
+        rows[9].fs2000_force / rows[9].uhb_force / 10, rel=1e-3)
+
+
+def test_compare_deck_no_cover(data, config):
+    path = os.path.join(DECKS, "KRAKEN.UMUHB")
+    with pytest.raises(ValueError):
+        fs2000.compare_deck(path, data, config)
+    assert fs2000.compare_deck(path, data, config, cover=0.5)
+
+
+def test_write_deck_round_trip(tmpdir, data, config):
+    path = str(tmpdir.join("UHB.UMUHB_750"))
+    fs2000.write_deck(path, data, 0.75, config)
+    assert fs2000.parse_deck(path).cover == 0.75
+    rows = fs2000.compare_deck(path, data, config)
+    assert len(rows) == len(config["tables"])
+    assert max(row.curve_diff for row in rows) < 1e-9
+
+
+def test_compare_decks_summary(data, config):
+    paths = [p for p in fs2000.find_decks(DECKS)
+             if fs2000.parse_deck(p).cover is not None]
+    rows = fs2000.compare_decks(paths, data, config, processes=0)
+    assert rows == fs2000.compare_decks(paths, data, config, processes=2)
+    stats = fs2000.summary(rows)
+    assert stats[1]["direction"] == "uplift"
+    assert stats[1]["decks"] == len(paths)
+    assert stats[1]["curve"] < 1e-3
+
+
+def test_cli_fs2000(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    with open("data.json", "w") as outfile:
+        json.dump(data_inputs, outfile)
+    output = str(tmpdir.join("fs2000.csv"))
+    result = CliRunner().invoke(cli.main, [
+        "fs2000", os.path.join(DECKS, "KRAKEN.UMUHB_500"), "-p", "0",
+        "-c", os.path.join(DECKS, "config.json"), "-o", output])
+    assert result.exit_code == 0
+    assert "1 decks compared" in result.output
+    with open(output) as infile:
+        assert len(infile.readlines()) == 11
@@ -66,3 +66,14 @@ def test_submerged_weight(gen_test_data):
     assert pytest.approx(general.submerged_weight(
         gen_test_data["D"], gen_test_data["t"], gen_test_data["t_coat"], 7850, 900, 0, 1025,
         9.81)) == gen_test_data["W_s"]
+
+
+def test_submerged_weight_contents(gen_test_data):
+    empty = general.submerged_weight(
+        gen_test_data["D"], gen_test_data["t"], gen_test_data["t_coat"], 7850,
+        900, 0, 1025, 9.81)
+    flooded = general.submerged_weight(
+        gen_test_data["D"], gen_test_data["t"], gen_test_data["t_coat"], 7850,
+        900, 1025, 1025, 9.81)
+    assert pytest.approx(flooded - empty, 0.001) == \
+        gen_test_data["A_i"] * 1025 * 9.81
@@ -0,0 +1,55 @@
+"""Tests for hobbs module."""
+
+import numpy as np
+import pytest
+
+from uhb import hobbs
+
+from . import tol_check
+
+
+def test_buckle_force():
+    assert tol_check(hobbs.buckle_force(207e9, 1e-5, 20), 4.179e5)
+
+
+def test_prebuckle_force_exceeds_buckle_force():
+    P = hobbs.buckle_force(207e9, 1e-5, 20)
+    P_0 = hobbs.prebuckle_force(207e9, 1e-5, 5e-3, 2000, 0.5, 20)
+    assert P_0 > P
+
+
+def test_mode_curves_shape(data):
+    curves = hobbs.mode_curves(data, np.array([0.5, 1.0, 1.5]),
+                               np.linspace(10, 100, 50))
+    assert all(np.shape(curve) == (3, 50) for curve in curves)
+    assert np.all(curves.P_0 >= curves.P)
+
+
+def test_critical_temperature(data):
+    h = np.array([0.5, 1.0, 1.5])
+    critical = hobbs.critical_temperature(data, h)
+    single = hobbs.critical_temperature(data, 1.0)
+    assert pytest.approx(critical.delta_T[1]) == single.delta_T
+    # More cover gives a larger download and a shorter, hotter buckle
+    assert np.all(np.diff(critical.delta_T) > 0)
+    assert np.all(np.diff(critical.L) < 0)
+    assert list(critical.safe) == list(critical.delta_T >= data.T - data.T_a)
+
+
+def test_critical_temperature_minimum(data):
+    L = np.linspace(5, 500, 20001)
+    critical = hobbs.critical_temperature(data, 1.0, L)
+    curves = hobbs.mode_curves(data, 1.0, L)
+    assert critical.delta_T == curves.delta_T.min()
+    assert L[0] < critical.L < L[-1]
+
+
+def test_critical_temperature_end_of_range(data):
+    # The curve falls towards its minimum over these lengths
+    L = np.linspace(5, 12, 10)
+    critical = hobbs.critical_temperature(data, np.array([0.5, 1.0]), L)
+    assert np.all(np.isnan(critical.delta_T))
+    assert np.all(np.isnan(critical.L))
+    assert not np.any(critical.safe)
+    single = hobbs.critical_temperature(data, 1.0, L)
+    assert np.isnan(single.delta_T) and not single.safe
@@ -0,0 +1,65 @@
+"""Tests for instrument module."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from uhb import analytical, cli, instrument, psi
+
+from .test_analytical import data_inputs
+
+
+@pytest.fixture
+def enabled():
+    instrument.reset()
+    instrument.enable()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disabled_records_nothing():
+    instrument.reset()
+    psi.Pu(0, 1, 0.2, 32, 18000)
+    with instrument.stage("block"):
+        pass
+    instrument.count("event")
+    assert instrument.report() == {"stages": {}, "counters": {}}
+
+
+def test_stage_and_timed(enabled):
+    with instrument.stage("block"):
+        psi.Pu(0, 1, 0.2, 32, 18000)
+    psi.Pu(0, 2, 0.2, 32, 18000)
+    stages = instrument.report()["stages"]
+    assert stages["block"]["calls"] == 1
+    assert stages["psi.Pu"]["calls"] == 2
+    assert stages["psi.Nqh.interp"]["calls"] == 2
+
+
+def test_cover_solve_counters(enabled):
+    analytical.required_sand_cover_height(3680, 0.1731, 18000, 0.36, 0)
+    counters = instrument.report()["counters"]
+    assert counters["analytical.cover_solve.calls"] == 1
+    assert counters["analytical.cover_solve.evaluations"] > 1
+    assert "analytical.cover_solve.failures" not in counters
+
+
+def test_to_json(enabled, tmpdir):
+    instrument.count("event", 3)
+    path = str(tmpdir.join("report.json"))
+    instrument.to_json(path)
+    with open(path) as infile:
+        assert json.load(infile)["counters"] == {"event": 3}
+
+
+def test_cli_profile_disables_after_run(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    with open("data.json", "w") as outfile:
+        json.dump(data_inputs, outfile)
+    result = CliRunner().invoke(cli.main, ["--profile", "anal"])
+    assert result.exit_code == 0
+    # The report goes to stderr, which every click version includes in output
+    assert "analytical.cover_solve" in result.output
+    assert not instrument.is_enabled()
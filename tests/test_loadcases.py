@@ -0,0 +1,72 @@
+"""Tests for loadcases module."""
+
+import json
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from uhb import analytical, cli, loadcases
+
+from .test_analytical import data_inputs
+
+
+def test_operating_state_matches_analytical(data):
+    results = loadcases.run_load_cases(data)
+    expected = analytical.run_analytical_calc(data)
+    i = results.names.index("operating")
+    assert pytest.approx(results.H[i]) == expected.H
+    assert pytest.approx(results.EAF[i]) == expected.EAF
+    assert results.governing == i
+
+
+def test_flooded_state_weight(data):
+    results = loadcases.run_load_cases(data)
+    flooded = results.names.index("flooded")
+    assert results.w_o[flooded] > results.w_o[0]
+    assert results.EAF[0] == results.H[0] == 0
+
+
+def test_load_cases_locations(data):
+    data = data._replace(D=np.array([0.1683, 0.2731, 0.3239]),
+                         t=np.array([0.011, 0.0127, 0.0143]))
+    states = [loadcases.State("cold", 0, 190e5, 20),
+              loadcases.State("hot", 0, 190e5, 50)]
+    results = loadcases.run_load_cases(data, states)
+    assert results.H.shape == (2, 3)
+    assert list(results.governing) == [1, 1, 1]
+    for i, D in enumerate(data.D):
+        single = analytical.run_analytical_calc(
+            data._replace(D=D, t=data.t[i]))
+        assert pytest.approx(results.H_max[i]) == single.H
+
+
+def test_load_cases_location_temperatures(data):
+    T = np.array([30, 40, 50])
+    results = loadcases.run_load_cases(data._replace(T=T))
+    assert results.H.shape == (4, 3)
+    operating = results.names.index("operating")
+    for i, T_i in enumerate(T):
+        single = analytical.run_analytical_calc(data._replace(T=T_i))
+        assert pytest.approx(results.H[operating, i]) == single.H
+
+
+def test_load_cases_state_temperatures(data):
+    states = [loadcases.State("hot", 0, 190e5, np.array([30, 40, 50]))]
+    results = loadcases.run_load_cases(data, states)
+    assert results.H.shape == (1, 3)
+    assert np.all(np.diff(results.H[0]) > 0)
+    single = analytical.run_analytical_calc(data._replace(T=40))
+    assert pytest.approx(results.H[0, 1]) == single.H
+
+
+def test_cli_load_cases(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    with open("data.json", "w") as outfile:
+        json.dump(data_inputs, outfile)
+    with open("states.json", "w") as outfile:
+        json.dump([{"name": "operating", "rho_cont": 0, "P_i": 190e5,
+                    "T": 50}], outfile)
+    result = CliRunner().invoke(cli.main, ["load-cases", "-s", "states.json"])
+    assert result.exit_code == 0
+    assert "Governing State:\noperating" in result.output
@@ -0,0 +1,42 @@
+"""Tests for plotting module."""
+
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from uhb import foundation, plotting
+
+
+def jobs(tmpdir, n):
+    xs = np.linspace(0, 10, 20)
+    return [
+        plotting.Job("spring", str(tmpdir.join(f"spring_{i}.png")),
+                     (0.01, 1000 * (i + 1))) if i % 2 else
+        plotting.Job("curve", str(tmpdir.join(f"curve_{i}.png")),
+                     (xs, {"a": xs ** 2, "b": xs}, "x", "y", "Curves"))
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_render_many(tmpdir, processes):
+    paths = plotting.render_many(jobs(tmpdir, 6), processes, chunksize=2)
+    assert len(paths) == 6
+    assert all(os.path.getsize(path) > 0 for path in paths)
+
+
+def test_render_many_skip(tmpdir):
+    assert plotting.render_many(jobs(tmpdir, 2), 0, plot=False) == []
+    assert tmpdir.listdir() == []
+
+
+def test_plot_wavelength_closes_figures(tmpdir):
+    path = str(tmpdir.join("profile.png"))
+    xs = np.linspace(0, 20, 10)
+    foundation.plot_wavelength(xs, foundation.foundation_profile(xs, 0.5, 20),
+                               20, path)
+    assert os.path.exists(path)
+    assert plt.get_fignums() == []
+    assert getattr(plotting._local, "figure", None) is None
@@ -1,8 +1,11 @@
 """Tests for pipe-soil interaction module."""
 
+import numpy as np
 import pytest
 
-from uhb import psi
+from uhb import cli, psi
+
+from .test_analytical import data_inputs
 
 
 @pytest.fixture(params=[
@@ -134,6 +137,11 @@ def test_delta_t(soil_type, expected):
     assert pytest.approx(psi.delta_t(soil_type)) == expected
 
 
+def test_delta_t_unknown_soil():
+    with pytest.raises(ValueError):
+        psi.delta_t("unknown")
+
+
 def test_Tu(gen_test_data):
     assert pytest.approx(
         psi.Tu(gen_test_data["D_o"], gen_test_data["H"], gen_test_data["c"], gen_test_data["f"],
@@ -217,3 +225,35 @@ def test_Qd(gen_test_data):
 # def test_gen_axial_spring_unknown_soil():
 #     with pytest.raises(ValueError):
 #         psi.gen_axial_spring(test_inputs[0], "none")
+
+
+@pytest.mark.parametrize(
+    "psi_s, expected", [(25, 0.29), (30, 0.29), (37.5, 0.545), (45, 0.62)]
+)
+def test_uplift_resistance_factor(psi_s, expected):
+    assert pytest.approx(psi.uplift_resistance_factor(psi_s)) == expected
+
+
+def test_F_uplift_d_psi_matches_soil_type():
+    assert pytest.approx(psi.F_uplift_d(None, 8000, 1, 0.5, psi_s=35)) == \
+        psi.F_uplift_d("medium sand", 8000, 1, 0.5)
+
+
+@pytest.mark.parametrize("gen_spring", [
+    psi.gen_uplift_spring, psi.gen_bearing_spring, psi.gen_axial_spring,
+    psi.gen_lateral_spring,
+])
+def test_gen_spring_unknown_model(gen_spring):
+    with pytest.raises(ValueError):
+        gen_spring(cli.convert(data_inputs), 1, "none")
+
+
+@pytest.mark.parametrize("gen_spring", [
+    psi.gen_uplift_spring, psi.gen_bearing_spring, psi.gen_axial_spring,
+    psi.gen_lateral_spring,
+])
+def test_gen_spring_scalar_floats(gen_spring):
+    spring = gen_spring(cli.convert(data_inputs), 1.0)
+    assert [type(value) for value in spring] == [float, float]
+    disp, resistance = gen_spring(cli.convert(data_inputs), np.array([1.0]))
+    assert np.shape(resistance) == (1,)
@@ -0,0 +1,50 @@
+"""Tests for reliability module."""
+
+import numpy as np
+import pytest
+
+from uhb import analytical, reliability
+
+
+V = reliability.RandomVariable
+
+variables = {
+    "delta": V("normal", 0.5, 0.1),
+    "f": V("lognormal", 0.36, 0.1),
+    "gamma_s": V("normal", 18000, 1000),
+    "T": V("normal", 50, 5),
+}
+
+
+def test_limit_state_zero_at_required_cover(data):
+    H = analytical.run_analytical_calc(data).H
+    assert pytest.approx(reliability.limit_state(data, H), abs=1e-6) == 0
+
+
+def test_limit_state_unknown_model(data):
+    with pytest.raises(ValueError):
+        reliability.limit_state(data, 1, "none")
+
+
+def test_form_design_point_on_limit_state(data):
+    H = np.array([0.6, 0.8, 1.0])
+    result = reliability.form(data, H, variables)
+    assert result.converged.all()
+    assert np.all(np.diff(result.beta) > 0)
+    design = analytical.replace_inputs(data, result.design_point)
+    g = reliability.limit_state(design, H)
+    assert pytest.approx(g, abs=1e-6) == [0, 0, 0]
+    alpha = np.array(list(result.alpha.values()))
+    assert pytest.approx(np.sum(alpha ** 2, axis=0)) == [1, 1, 1]
+
+
+def test_sorm_against_monte_carlo(data):
+    H = 0.7
+    result = reliability.form(data, H, variables)
+    second = reliability.sorm(data, H, variables, result)
+
+    rng = np.random.RandomState(0)
+    x = {name: reliability.to_physical(v, rng.standard_normal(200000))
+         for name, v in variables.items()}
+    g = reliability.limit_state(analytical.replace_inputs(data, x), H)
+    assert pytest.approx(second.pf, rel=0.1) == np.mean(g < 0)
@@ -0,0 +1,97 @@
+"""Tests for route module."""
+
+import numpy as np
+import pytest
+
+from uhb import analytical, cli, psi, route
+
+from .test_analytical import data_inputs
+
+
+@pytest.fixture
+def zones():
+    data = cli.convert(data_inputs)
+    return {0: data, 1: data._replace(soil_type="loose sand", psi_s=30)}
+
+
+def test_dtype_packed():
+    assert route.DTYPE.itemsize == 49
+    assert route.empty(10).nbytes == 490
+
+
+def test_zone_out_of_range():
+    with pytest.raises(ValueError):
+        route.from_arrays(np.arange(2.0), 1.0, [0, 256])
+
+
+def test_zone_table(zones):
+    table = route.zone_table({0: zones[0], 2: zones[1]})
+    assert table["H"][2] == analytical.run_analytical_calc(zones[1]).H
+    assert np.isnan(table["H"][1])
+
+
+def test_spring_views():
+    r = route.from_arrays(np.arange(5.0), 1.0)
+    disp, resistance = route.spring(r, "uplift")
+    resistance[:] = 2.0
+    assert np.shares_memory(disp, r)
+    assert list(r["uplift_resistance"]) == [2.0] * 5
+
+
+def test_evaluate(zones):
+    r = route.from_arrays(np.arange(6) * 0.3, np.linspace(0.5, 1.5, 6),
+                          np.arange(6) % 2)
+    route.evaluate(r, zones, {"uplift": "f110"}, chunk_size=4)
+    data = zones[1]
+    cover = float(r["cover"][3])
+    disp, resistance = psi.gen_uplift_spring(data, cover, "f110")
+    assert pytest.approx(r["uplift_resistance"][3], 1e-6) == resistance
+    assert pytest.approx(r["uplift_disp"][3], 1e-6) == disp
+    H = analytical.run_analytical_calc(data).H
+    assert pytest.approx(r["utilisation"][3], 1e-6) == H / cover
+
+
+def test_evaluate_unknown_zone(zones):
+    r = route.from_arrays(np.arange(6) * 0.3, 1.0, [0, 1, 2, 0, 1, 5])
+    with pytest.raises(ValueError, match=r"\[2, 5\]"):
+        route.evaluate(r, zones, chunk_size=4)
+    assert np.all(r["utilisation"] == 0)
+
+
+def test_evaluate_zero_cover(zones):
+    r = route.from_arrays(np.arange(2) * 0.3, [0.0, 1.0])
+    route.evaluate(r, zones)
+    H = route.zone_table(zones)["H"][0]
+    assert H > 0 and np.isinf(r["utilisation"][0])
+    assert pytest.approx(r["utilisation"][1]) == H
+
+
+def test_evaluate_failed_cover(zones, monkeypatch):
+    calc = analytical.run_analytical_calc
+    monkeypatch.setattr(analytical, "run_analytical_calc",
+                        lambda data: calc(data)._replace(H=float("nan")))
+    r = route.from_arrays(np.arange(2) * 0.3, [0.0, 1.0])
+    route.evaluate(r, zones)
+    assert np.all(np.isnan(r["utilisation"]))
+
+
+def test_memmap_round_trip(zones, tmpdir):
+    path = str(tmpdir.join("route.npy"))
+    r = route.from_arrays(np.arange(4) * 0.3, 1.0, path=path)
+    route.evaluate(r, zones)
+    del r
+    mapped = route.load(path)
+    assert isinstance(mapped, np.memmap)
+    assert mapped["KP"][3] == pytest.approx(0.9)
+    assert np.all(mapped["axial_resistance"] > 0)
+
+    copy = str(tmpdir.join("copy.npy"))
+    route.save(copy, mapped)
+    assert np.array_equal(route.load(copy), mapped)
+
+
+def test_load_not_a_route(tmpdir):
+    path = str(tmpdir.join("other.npy"))
+    np.save(path, np.zeros(3))
+    with pytest.raises(ValueError):
+        route.load(path)
@@ -0,0 +1,90 @@
+"""Tests for stiffness module."""
+
+import csv
+import io
+import json
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from uhb import cli, psi, stiffness
+
+from .test_analytical import data_inputs
+
+
+@pytest.fixture
+def soils():
+    data = cli.convert(data_inputs)
+    return {
+        "dense sand": data,
+        "soft clay": data._replace(soil_type="soft clay", psi_s=0, c=5000),
+    }
+
+
+def test_soil_stiffnesses(soils):
+    data = soils["dense sand"]
+    table = stiffness.soil_stiffnesses(data, np.array([0.5, 1.0]))
+    disp, Q_u = psi.gen_uplift_spring(data, 1.0)
+    assert pytest.approx(table["Q_u"][1]) == Q_u
+    assert pytest.approx(table["K_vu"][1]) == Q_u / disp
+    assert list(table["delta_t"]) == [0.003, 0.003]
+
+
+def test_cover_heights():
+    heights = stiffness.cover_heights(0.1, 0.5, 0.1)
+    assert [repr(float(h)) for h in heights] == [
+        "0.1", "0.2", "0.3", "0.4", "0.5"]
+
+
+def test_write_json(soils):
+    outfile = io.StringIO()
+    stiffness.write_json(outfile, stiffness.iter_table(
+        soils, [0.1, 0.2, 0.3], chunk_size=2))
+    table = json.loads(outfile.getvalue())
+    assert list(table) == ["dense sand", "soft clay"]
+    assert list(table["soft clay"]) == ["0.1", "0.2", "0.3"]
+    assert set(table["soft clay"]["0.3"]) == set(stiffness.FIELDS)
+
+
+def test_write_csv(soils):
+    outfile = io.StringIO()
+    stiffness.write_csv(outfile, stiffness.iter_table(soils, [0.1, 0.2]))
+    rows = list(csv.DictReader(io.StringIO(outfile.getvalue())))
+    assert len(rows) == 4
+    assert rows[2]["soil_type"] == "soft clay"
+
+
+def test_write_npy(soils, tmpdir):
+    path = str(tmpdir.join("table.npy"))
+    stiffness.write_npy(path, stiffness.iter_table(
+        soils, np.arange(1, 11) / 10, chunk_size=3), 20)
+    table = np.load(path)
+    assert list(table["soil_type"][[0, 10]]) == ["dense sand", "soft clay"]
+    assert pytest.approx(table["h"][-1]) == 1.0
+
+
+def test_stiffness_table_command(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    with open("data.json", "w") as f:
+        json.dump(data_inputs, f)
+    with open("soils.json", "w") as f:
+        json.dump({"loose sand": {"psi_s": 30}, "stiff clay": {"c": 1e4}}, f)
+    result = CliRunner().invoke(cli.main, [
+        "stiffness-table", "out.json", "--soils", "soils.json",
+        "--start", "0.5", "--stop", "1.5", "--step", "0.5"])
+    assert result.exit_code == 0
+    with open("out.json") as f:
+        table = json.load(f)
+    assert list(table["stiff clay"]) == ["0.5", "1.0", "1.5"]
+
+
+def test_stiffness_table_default_grid(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    with open("data.json", "w") as f:
+        json.dump(data_inputs, f)
+    result = CliRunner().invoke(cli.main, ["stiffness-table", "out.json"])
+    assert result.exit_code == 0
+    with open("out.json") as f:
+        table = json.load(f)
+    assert list(table["dense sand"]) == ["0.1", "0.2", "0.3", "0.4", "0.5"]
@@ -0,0 +1,88 @@
+"""Tests for store module."""
+
+import numpy as np
+import pytest
+
+from uhb import analytical, cli, store
+
+from .test_analytical import data_inputs
+
+
+@pytest.fixture
+def path(tmpdir):
+    path = str(tmpdir.join("results"))
+    store.append(path, {"soil_type": "dense sand",
+                        "D": np.array([0.2, 0.3, 0.4]), "H": [1, 2, 3]})
+    store.append(path, {"soil_type": "soft clay",
+                        "D": np.array([0.5, 0.6]), "H": [4, 5]})
+    return path
+
+
+def test_index(path):
+    chunks = store.load_index(path)["chunks"]
+    assert [c["rows"] for c in chunks] == [3, 2]
+    assert chunks[0]["columns"]["D"]["max"] == 0.4
+    assert chunks[1]["columns"]["soil_type"]["values"] == ["soft clay"]
+
+
+def test_query(path):
+    result = store.query(path, soil_type="dense sand", D=(">", 0.25))
+    assert list(result["H"]) == [2, 3]
+    assert list(result["soil_type"]) == ["dense sand"] * 2
+
+
+def test_query_skips_chunks(path):
+    chunks = list(store.iter_query(path, ["H"], D=(">=", 0.5)))
+    assert len(chunks) == 1
+    assert list(chunks[0]["H"]) == [4, 5]
+
+
+def test_query_no_match(path):
+    assert store.query(path, soil_type="loose sand") == {}
+
+
+def test_replace_named_chunk(path):
+    with pytest.raises(ValueError):
+        store.append(path, {"H": [6]}, name="chunk_000001")
+    store.append(path, {"soil_type": "soft clay", "D": [0.7], "H": [6]},
+                 name="chunk_000001", replace=True)
+    assert list(store.query(path, soil_type="soft clay")["H"]) == [6]
+
+
+def test_replace_drops_old_columns(tmpdir):
+    path = str(tmpdir.join("results"))
+    store.append(path, {"x": [1, 2], "y": [5, 6]}, name="a")
+    store.append(path, {"x": [3]}, name="a", replace=True)
+    result = store.query(path)
+    assert list(result) == ["x"] and list(result["x"]) == [3]
+    assert list(store.open_chunk(path, "a")) == ["x"]
+    assert len(tmpdir.join("results").listdir()) == 2
+
+
+def test_auto_name_skips_named_chunks(tmpdir):
+    path = str(tmpdir.join("results"))
+    store.append(path, {"x": [1, 2]}, name="chunk_000001")
+    store.append(path, {"x": [3]})
+    store.append(path, {"x": [4]})
+    names = [c["name"] for c in store.load_index(path)["chunks"]]
+    assert names == ["chunk_000001", "chunk_000000", "chunk_000002"]
+    assert sorted(store.query(path)["x"]) == [1, 2, 3, 4]
+
+
+def test_held_index(path):
+    index = store.load_index(path)
+    name = store.append(path, {"D": [0.9], "H": [7]}, index=index)
+    assert len(store.load_index(path)["chunks"]) == 2
+    store.write_index(path, index)
+    assert list(store.open_chunk(path, name)["H"]) == [7]
+    with pytest.raises(ValueError):
+        store.append(path, {"H": [8]}, name, replace=True, index=index)
+
+
+def test_case_columns(tmpdir):
+    data = cli.convert(data_inputs)._replace(T=np.array([30.0, 50.0]))
+    results = analytical.run_analytical_calc(data)
+    path = str(tmpdir.join("results"))
+    store.append(path, store.case_columns(data, results))
+    result = store.query(path, ["T", "H"], T=50)
+    assert pytest.approx(result["H"], 1e-3) == [0.5506]
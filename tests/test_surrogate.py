@@ -0,0 +1,44 @@
+"""Tests for surrogate module."""
+
+import os
+
+import numpy as np
+import pytest
+
+from uhb import surrogate
+
+
+@pytest.mark.parametrize(
+    "kernel, method", [("Qd", "linear"), ("Qd", "cubic"),
+                       ("Pu", "linear"), ("F_uplift_d", "linear")]
+)
+def test_error_bound(data, kernel, method):
+    surface = surrogate.build(kernel, data, tol=1e-3, method=method)
+    assert surface.error <= 1e-3
+    rng = np.random.RandomState(0)
+    psi_s = rng.uniform(20, 45, 1000)
+    H = rng.uniform(0.5, 20, 1000) * surface.params["D"]
+    exact = surrogate.exact(kernel, surface.params, psi_s, H)
+    approx = surrogate.evaluate(surface, psi_s, H)
+    assert np.max(np.abs(approx - exact) / exact) <= 1e-3
+
+
+def test_outside_table_uses_exact(data):
+    surface = surrogate.build("Qd", data, tol=1e-2)
+    params = surface.params
+    assert surrogate.evaluate(surface, 50, 1) == \
+        surrogate.exact("Qd", params, 50, 1)
+
+
+def test_unreachable_tolerance(data):
+    with pytest.raises(ValueError):
+        surrogate.build("Qd", data, tol=1e-12, max_points=10 ** 4)
+
+
+def test_cache(data, tmpdir):
+    cache_dir = str(tmpdir)
+    surface = surrogate.build("Pu", data, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    cached = surrogate.build("Pu", data, cache_dir=cache_dir)
+    assert np.array_equal(cached.values, surface.values)
+    assert cached.error == surface.error
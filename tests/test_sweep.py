@@ -0,0 +1,139 @@
+"""Tests for sweep module."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from uhb import analytical, cli, store, sweep
+
+from .test_analytical import data_inputs
+
+
+GRID = {"T": np.linspace(20, 80, 7), "P_i": np.linspace(1e6, 2e7, 5)}
+
+
+def test_chunk_cases():
+    cases, inputs = sweep.chunk_cases(GRID, 3, 4)
+    assert list(cases) == [12, 13, 14, 15]
+    assert list(inputs["T"]) == [GRID["T"][2]] * 3 + [GRID["T"][3]]
+    assert inputs["P_i"][0] == GRID["P_i"][2]
+    assert sweep.n_chunks(GRID, 4) == 9
+
+
+def test_run(data, tmpdir):
+    path = str(tmpdir.join("sweep"))
+    assert sweep.run(path, data, GRID, chunk_size=4) == 9
+    result = sweep.results(path, ["T", "P_i", "H"])
+    assert list(result["case"]) == list(range(35))
+    expected = analytical.run_analytical_calc(
+        data._replace(T=result["T"][17], P_i=result["P_i"][17]))
+    assert pytest.approx(result["H"][17]) == expected.H
+
+
+def test_resume(data, tmpdir):
+    path = str(tmpdir.join("sweep"))
+
+    def interrupt(chunk_id, total):
+        if chunk_id == 2:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        sweep.run(path, data, GRID, chunk_size=4, progress=interrupt)
+    assert sweep.completed(path) == {"chunk_000000", "chunk_000001",
+                                     "chunk_000002"}
+    assert sweep.run(path, data, GRID, chunk_size=4, max_chunks=2) == 2
+    assert sweep.run(path, data, GRID, chunk_size=4) == 4
+    assert sweep.run(path, data, GRID, chunk_size=4) == 0
+
+    full = str(tmpdir.join("full"))
+    sweep.run(full, data, GRID, chunk_size=4)
+    assert np.array_equal(sweep.results(path)["H"], sweep.results(full)["H"])
+
+
+def test_resume_different_grid(data, tmpdir):
+    path = str(tmpdir.join("sweep"))
+    sweep.run(path, data, GRID, chunk_size=4, max_chunks=1)
+    with pytest.raises(ValueError):
+        sweep.run(path, data, GRID, chunk_size=5)
+
+
+def test_resume_different_inputs(data, tmpdir):
+    path = str(tmpdir.join("sweep"))
+    sweep.run(path, data, GRID, chunk_size=4, max_chunks=1)
+    with pytest.raises(ValueError):
+        sweep.run(path, data._replace(gamma_s=19000), GRID, chunk_size=4)
+    assert sweep.run(path, data, GRID, chunk_size=4) == 8
+
+
+def test_checkpoint(data, tmpdir, monkeypatch):
+    path = str(tmpdir.join("sweep"))
+    writes = []
+    write_index = store.write_index
+    monkeypatch.setattr(store, "write_index", lambda path, index: (
+        writes.append(len(index["chunks"])), write_index(path, index)))
+    assert sweep.run(path, data, GRID, chunk_size=4, checkpoint=4) == 9
+    assert writes == [4, 8, 9]
+
+
+def test_resume_after_lost_batch(data, tmpdir):
+    path = str(tmpdir.join("sweep"))
+    sweep.run(path, data, GRID, chunk_size=4, max_chunks=2)
+    # Chunks written without their index, as after the process is killed
+    index = store.load_index(path)
+    columns = sweep.chunk_cases(GRID, 2, 4)[1]
+    store.append(path, columns, sweep.chunk_name(2), index=index)
+    assert sweep.completed(path) == {"chunk_000000", "chunk_000001"}
+    assert sweep.run(path, data, GRID, chunk_size=4) == 7
+    assert sorted(os.listdir(path)) == sorted(
+        [sweep.chunk_name(i) for i in range(9)] + ["index.json",
+                                                   sweep.MANIFEST])
+
+
+def test_springs(data, tmpdir):
+    path = str(tmpdir.join("sweep"))
+    grid = {"h": np.linspace(0.5, 2, 4), "psi_s": np.array([30, 35])}
+    sweep.run(path, data, grid, "springs", chunk_size=3)
+    result = sweep.results(path, ["h", "psi_s", "Q_u"], psi_s=35)
+    assert list(result["h"]) == list(grid["h"])
+    assert len(store.load_index(path)["chunks"]) == 3
+
+
+@pytest.mark.parametrize("kernel, grid", [
+    ("springs", GRID),
+    ("analytical", {"h": np.linspace(0.5, 2, 4)}),
+    ("analytical", {"H_max": np.linspace(0.5, 2, 4)}),
+    ("analytical", {"T": np.array([])}),
+    ("stress", GRID),
+])
+def test_run_invalid_grid(data, tmpdir, kernel, grid):
+    path = str(tmpdir.join("sweep"))
+    with pytest.raises(ValueError):
+        sweep.run(path, data, grid, kernel)
+    assert not tmpdir.join("sweep").check()
+
+
+@pytest.mark.parametrize("spec", ["T=20:80", "T", "T=a:b:7", "=20:80:7",
+                                  "h=0.5:2:4"])
+def test_cli_sweep_bad_grid(tmpdir, monkeypatch, spec):
+    monkeypatch.chdir(tmpdir)
+    with open("data.json", "w") as outfile:
+        json.dump(data_inputs, outfile)
+    result = CliRunner().invoke(cli.main, ["sweep", "results", "-g", spec])
+    assert result.exit_code == 2
+    assert "Invalid value for" in result.output and "--grid" in result.output
+    assert not tmpdir.join("results").check()
+
+
+def test_cli_sweep(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    with open("data.json", "w") as outfile:
+        json.dump(data_inputs, outfile)
+    args = ["sweep", "results", "-g", "T=20:80:7", "--chunk-size", "2"]
+    result = CliRunner().invoke(cli.main, args + ["--max-chunks", "3"])
+    assert result.exit_code == 0
+    assert "3 chunks evaluated, 1 remaining" in result.output
+    result = CliRunner().invoke(cli.main, args)
+    assert "1 chunks evaluated, 0 remaining" in result.output
@@ -1,7 +1,9 @@
 from collections import namedtuple
-import scipy.optimize
+import numpy as np
 
+from uhb import dual
 from uhb import general
+from uhb import instrument
 from uhb import psi
 
 
@@ -12,33 +14,84 @@ def required_download(delta, E, I, EAF, w_o):
     return term1 * EAF * term2
 
 
+def cover_resistance(H, D, gamma, f, c):
+    """ Returns the uplift resistance of cover height H: OTC 6486 in cohesive
+    soil (c > 0), DNV-RP-F110 otherwise.
+    """
+    return np.where(
+        c > 0, psi.P_otc6486(H, D, gamma, c), psi.R_max(H, D, gamma, f))[()]
+
+
+def secant(func, x0, args=(), tol=1.48e-8, maxiter=50):
+    """ Returns the roots of func(x, *args) by the secant method from x0,
+    element-wise over arrays, and whether each converged.
+
+    Steps and tolerances follow scipy.optimize.newton without a derivative,
+    but failures are only reported through the converged mask, so the solve
+    neither warns nor raises and needs no process wide warning filters.
+    """
+    p0 = np.array(x0, dtype=float)
+    p1 = p0 * (1 + 1e-4) + np.where(p0 >= 0, 1e-4, -1e-4)
+    q0, q1 = func(p0, *args), func(p1, *args)
+    p = p1
+    converged = np.zeros(np.shape(p1), dtype=bool)
+    failed = converged.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(maxiter):
+            # Converged elements keep stepping until all have, as in scipy
+            dq = q1 - q0
+            step = np.where(dq != 0, q1 * (p1 - p0) / dq, 0)
+            p = p1 - step
+            converged |= (np.abs(step) < tol) & ((dq != 0) | (q1 == 0))
+            failed |= ~converged & ((dq == 0) | ~np.isfinite(p))
+            if np.all(converged | failed):
+                break
+            p0, q0, p1 = p1, q1, p
+            q1 = func(p1, *args)
+    return p[()], (converged & np.isfinite(p))[()]
+
+
 def required_sand_cover_height(required_resistance, D, gamma, f, c):
     """ Returns the sand cover height to provide the required uplift resistance.
+
+    Inputs may be arrays, solved element-wise in one call, and Duals, in which
+    case the derivatives of the root follow from the implicit function theorem.
+    Elements of an array solve that do not converge are nan; a scalar solve
+    that does not converge raises RuntimeError.
     """
 
-    def solve_sand(H):
-        return psi.R_max(H, D, gamma, f) - required_resistance
+    def residual(H, required_resistance, D, gamma, f, c):
+        instrument.count("analytical.cover_solve.evaluations")
+        return cover_resistance(H, D, gamma, f, c) - required_resistance
 
-    def solve_clay(H):
-        return psi.P_otc6486(H, D, gamma, c) - required_resistance
+    args = (required_resistance, D, gamma, f, c)
+    values = tuple(dual.value(a) for a in args)
+    x0 = np.full(np.broadcast(*values).shape, 1e-3)
 
-    # TODO: exception catch for solve
-    if c > 0:
-        return scipy.optimize.newton(solve_clay, 1e-3)
+    instrument.count("analytical.cover_solve.calls")
+    with instrument.stage("analytical.cover_solve"):
+        H, converged = secant(residual, x0, values)
 
-    else:
-        return scipy.optimize.newton(solve_sand, 1e-3)
+    failures = int(np.sum(~converged))
+    if failures:
+        instrument.count("analytical.cover_solve.failures", failures)
+        if np.ndim(H) == 0:
+            raise RuntimeError(f"Failed to converge, value is {H}.")
+        H = np.where(converged, H, np.nan)
 
+    return dual.implicit(residual, H, *args)
 
-def run_analytical_calc(data):
+
+def stability_download(data):
+    """ Returns the pipe section properties, effective axial force, submerged
+    weight and required download for stability.
+    """
     D, t, t_coat = data.D, data.t, data.t_coat
     delta_P = data.P_i - data.P_e
     delta_T = data.T - data.T_a
     v, alpha, E, rho_p = data.v, data.alpha, data.E, data.rho_p
     rho_coat, rho_cont = data.rho_coat, data.rho_cont
     delta = max(data.deltas)
-    soil_type = data.soil_type
-    gamma, f, c = data.gamma_s, data.f, data.c
     rho_sw, g = data.rho_sw, data.g
 
     D_tot = general.total_outside_diameter(D, t_coat)
@@ -50,8 +103,51 @@ def run_analytical_calc(data):
     w_o = general.submerged_weight(
         D, t, t_coat, rho_p, rho_coat, rho_cont, rho_sw, g)
     w = required_download(delta, E, I, EAF, w_o)
-    q = max(w - w_o, 0)
-    H = required_sand_cover_height(q, D_tot, gamma, f, c)
+
+    Download = namedtuple("Download", "D_tot I EAF w_o w")
+    return Download(D_tot, I, EAF, w_o, w)
+
+
+@instrument.timed("analytical.run_analytical_calc")
+def run_analytical_calc(data):
+    gamma, f, c = data.gamma_s, data.f, data.c
+
+    download = stability_download(data)
+    q = np.maximum(download.w - download.w_o, 0)
+    H = required_sand_cover_height(q, download.D_tot, gamma, f, c)
 
     Results = namedtuple("Results", "I EAF w_o w q H")
-    return Results(I, EAF, w_o, w, q, H)
+    return Results(download.I, download.EAF, download.w_o, download.w, q, H)
+
+
+def input_value(data, name):
+    """ Returns the named input; "delta" is the governing imperfection height.
+    """
+    return max(data.deltas) if name == "delta" else getattr(data, name)
+
+
+def replace_inputs(data, values):
+    """ Returns data with the named inputs replaced; "delta" replaces the
+    imperfection heights with a single governing value.
+    """
+    values = dict(values)
+    if "delta" in values:
+        values["deltas"] = [values.pop("delta")]
+    return data._replace(**values)
+
+
+SENSITIVITY_INPUTS = (
+    "D", "t", "t_coat", "P_i", "P_e", "T", "T_a", "rho_p", "rho_coat",
+    "rho_cont", "v", "alpha", "E", "delta", "gamma_s", "f", "c", "rho_sw", "g",
+)
+
+
+def cover_height_sensitivities(data, names=SENSITIVITY_INPUTS):
+    """ Returns the required cover height and a dictionary of its derivatives
+    with respect to each named input, from one forward-mode evaluation of the
+    analytical calculation.
+    """
+    seeded = dual.seed({name: input_value(data, name) for name in names})
+
+    H = run_analytical_calc(replace_inputs(data, seeded)).H
+    return dual.value(H), dict(zip(names, dual.derivatives(H, len(names))))
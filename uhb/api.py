@@ -0,0 +1,129 @@
+""" Library API
+
+Calculation entry points for use outside the command line. Inputs are given
+explicitly as a dictionary, a data namedtuple or the path of a JSON file, so
+nothing depends on the working directory, and results are returned as plain
+dictionaries without writing files or printing. Apart from the opt-in,
+lock protected instrument counters the functions hold no shared state and
+change no process wide settings such as warning filters, so they can be
+called from many threads at once. Python 3.7 or later is needed for the
+async wrappers.
+
+The async wrappers offload calls to a thread or process executor. Data
+namedtuples cannot be pickled, so pass dictionaries or paths to process
+executors.
+"""
+
+import asyncio
+import functools
+import json
+from collections import namedtuple
+
+from uhb import analytical as a, hobbs, loadcases, psi, stiffness
+
+
+def convert(dictionary):
+    """Convert a dictionary to a named tuple."""
+    return namedtuple('Data', dictionary.keys())(**dictionary)
+
+
+def load_data(path):
+    """ Returns the data namedtuple of a JSON input file.
+    """
+    with open(path, "r") as input_file:
+        return convert(json.load(input_file))
+
+
+def as_data(inputs):
+    """ Returns inputs given as a dictionary, data namedtuple or JSON file
+    path as a data namedtuple.
+    """
+    if isinstance(inputs, dict):
+        return convert(inputs)
+    if isinstance(inputs, str):
+        return load_data(inputs)
+    return inputs
+
+
+def analytical(inputs):
+    """ Returns the analytical required cover height calculation.
+    """
+    return a.run_analytical_calc(as_data(inputs))._asdict()
+
+
+SPRINGS = {
+    "uplift": psi.gen_uplift_spring,
+    "bearing": psi.gen_bearing_spring,
+    "axial": psi.gen_axial_spring,
+    "lateral": psi.gen_lateral_spring,
+}
+
+
+def springs(inputs, h, models=None):
+    """ Returns the displacement and resistance of each soil spring at cover
+    height h [m].
+
+    :param dict models: spring models by direction, ASCE by default
+    """
+    data, models = as_data(inputs), models or {}
+    result = {}
+    for direction, gen_spring in SPRINGS.items():
+        disp, resistance = gen_spring(data, h, models.get(direction, "asce"))
+        result[direction] = {"disp": disp, "resistance": resistance}
+    return result
+
+
+def stiffnesses(inputs, h, models=None):
+    """ Returns the spring resistances, displacements and stiffnesses at
+    cover heights h [m], see stiffness.soil_stiffnesses.
+    """
+    return stiffness.soil_stiffnesses(as_data(inputs), h, models)
+
+
+def load_cases(inputs, states=None):
+    """ Returns the required cover height for each state, see
+    loadcases.run_load_cases. States may be dictionaries.
+    """
+    if states is not None:
+        states = [loadcases.State(**s) if isinstance(s, dict) else s
+                  for s in states]
+    return loadcases.run_load_cases(as_data(inputs), states)._asdict()
+
+
+def critical_temperature(inputs, h, L=hobbs.LENGTHS, model="f110",
+                         phi_a=0.5):
+    """ Returns the Hobbs critical temperature rise at cover heights h [m],
+    see hobbs.critical_temperature.
+    """
+    return hobbs.critical_temperature(
+        as_data(inputs), h, L, model, phi_a)._asdict()
+
+
+async def run_async(func, *args, executor=None, **kwargs):
+    """ Runs func(*args, **kwargs) in executor, the loop's default thread
+    pool if None, and returns its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(func, *args, **kwargs))
+
+
+async def map_async(func, batch, *args, executor=None, **kwargs):
+    """ Returns the results of func for each inputs in batch, run
+    concurrently in executor.
+    """
+    return await asyncio.gather(*(
+        run_async(func, inputs, *args, executor=executor, **kwargs)
+        for inputs in batch))
+
+
+async def analytical_async(inputs, executor=None):
+    return await run_async(analytical, inputs, executor=executor)
+
+
+async def springs_async(inputs, h, models=None, executor=None):
+    return await run_async(springs, inputs, h, models, executor=executor)
+
+
+async def load_cases_async(inputs, states=None, executor=None):
+    return await run_async(load_cases, inputs, states, executor=executor)
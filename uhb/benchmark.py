@@ -0,0 +1,216 @@
+""" Benchmark module """
+
+import json
+import math
+import platform
+import timeit
+import warnings
+
+import numpy as np
+
+from uhb import analytical, foundation, psi, ramberg
+
+
+SIZES = (1, 10 ** 3, 10 ** 5, 10 ** 7)
+
+
+def _batch(value, n, spread=0.0):
+    """ Returns a batch of n inputs around value, or value itself for n == 1.
+    """
+    if n == 1:
+        return value
+    return value * np.linspace(1 - spread, 1 + spread, n)
+
+
+def _psi_args(data, n):
+    D_o = data.D + 2 * data.t_coat
+    return D_o, _batch(1.0, n, 0.5)
+
+
+def _nqh(data, n):
+    D_o, H = _psi_args(data, n)
+    return psi.Nqh, (data.psi_s, H, D_o)
+
+
+def _qu(data, n):
+    D_o, H = _psi_args(data, n)
+    return psi.Qu, (data.psi_s, data.c, D_o, data.gamma_s, H)
+
+
+def _qd(data, n):
+    D_o, H = _psi_args(data, n)
+    return psi.Qd, (data.psi_s, data.c, D_o, data.gamma_s, H, data.rho_sw)
+
+
+def _pu(data, n):
+    D_o, H = _psi_args(data, n)
+    return psi.Pu, (data.c, H, D_o, data.psi_s, data.gamma_s)
+
+
+def _tu(data, n):
+    D_o, H = _psi_args(data, n)
+    return psi.Tu, (D_o, H, data.c, data.f, data.psi_s, data.gamma_s)
+
+
+def _spring(gen):
+    def setup(data, n):
+        return gen, (data, _batch(1.0, n, 0.5))
+    return setup
+
+
+def _analytical(data, n):
+    def calc(T):
+        return analytical.run_analytical_calc(data._replace(T=T))
+    return calc, (_batch(data.T, n, 0.5),)
+
+
+def _cover(data, n):
+    D_o = data.D + 2 * data.t_coat
+    return analytical.required_sand_cover_height, (
+        _batch(3000.0, n, 0.5), D_o, data.gamma_s, data.f, data.c)
+
+
+def _ramberg(data, n):
+    return ramberg.ramberg_osgood, (
+        _batch(data.SMYS, n, 0.1), data.SMYS_e, data.SMTS, data.SMTS_e, data.E)
+
+
+def _profile(data, n):
+    def profile(xs):
+        L_o = foundation.natural_wavelength(
+            1, 2.07e11, 1.6895e-05, 0.5, 193.34)
+        return foundation.foundation_profile(xs * L_o, 0.5, L_o)
+    return profile, (_batch(0.5, n, 1.0),)
+
+
+CASES = {
+    "psi.Nqh": _nqh,
+    "psi.Qu": _qu,
+    "psi.Qd": _qd,
+    "psi.Pu": _pu,
+    "psi.Tu": _tu,
+    "psi.gen_uplift_spring": _spring(psi.gen_uplift_spring),
+    "psi.gen_bearing_spring": _spring(psi.gen_bearing_spring),
+    "psi.gen_axial_spring": _spring(psi.gen_axial_spring),
+    "psi.gen_lateral_spring": _spring(psi.gen_lateral_spring),
+    "analytical.run_analytical_calc": _analytical,
+    "analytical.required_sand_cover_height": _cover,
+    "ramberg.ramberg_osgood": _ramberg,
+    "foundation.foundation_profile": _profile,
+}
+
+
+def _looped(func, args, n):
+    """ Returns a callable evaluating func element by element over a batch.
+    """
+    def call():
+        for i in range(n):
+            func(*(a[i] if isinstance(a, np.ndarray) else a for a in args))
+    return call
+
+
+def _best_time(call, repeat):
+    """ Returns the best time [s] of a single call over repeat autoranges.
+    """
+    timer = timeit.Timer(call)
+    return min(total / number for number, total in
+               (timer.autorange() for _ in range(repeat)))
+
+
+def time_case(setup, data, n, repeat=3, budget=60.0, estimate=None):
+    """ Returns the timing of one case at batch size n as a dictionary.
+
+    Array inputs are passed to the function in one call. Functions that cannot
+    take arrays are evaluated element by element, unless the time estimated
+    from a smaller batch exceeds the budget [s], in which case the size is
+    skipped.
+    """
+    func, args = setup(data, n)
+    mode = "scalar" if n == 1 else "vector"
+    if n > 1:
+        try:
+            func(*args)
+        except (TypeError, ValueError):
+            mode = "loop"
+
+    if mode == "loop" and estimate is not None and estimate * n > budget:
+        return {"mode": "skipped", "seconds": None,
+                "estimate": estimate * n}
+
+    call = (lambda: func(*args)) if mode != "loop" else _looped(func, args, n)
+    seconds = _best_time(call, repeat)
+    return {"mode": mode, "seconds": seconds, "per_item": seconds / n}
+
+
+def scaling_exponent(n1, t1, n2, t2):
+    """ Returns the exponent k of t ~ n^k between two batch sizes.
+    """
+    return math.log(t2 / t1) / math.log(n2 / n1)
+
+
+def run_benchmarks(data, sizes=SIZES, names=None, repeat=3, budget=60.0):
+    """ Returns benchmark timings for each case and batch size.
+    """
+    results = {}
+    for name, setup in CASES.items():
+        if names and name not in names:
+            continue
+        timings = {}
+        previous = None
+        for n in sorted(sizes):
+            estimate = previous["per_item"] if previous else None
+            timing = time_case(setup, data, n, repeat, budget, estimate)
+            if timing["seconds"] is not None:
+                if previous:
+                    timing["exponent"] = scaling_exponent(
+                        previous["size"], previous["seconds"],
+                        n, timing["seconds"])
+                previous = dict(timing, size=n)
+            timings[str(n)] = timing
+        results[name] = timings
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.25):
+    """ Returns a list of (name, size, ratio) for every case that is slower
+    than the baseline by more than the threshold fraction. Warns if the
+    baseline was recorded with a different Python, NumPy or machine.
+    """
+    meta, base_meta = current.get("meta", {}), baseline.get("meta", {})
+    differences = [
+        f"{key} {base_meta.get(key)} -> {meta.get(key)}"
+        for key in sorted(set(meta) | set(base_meta))
+        if meta.get(key) != base_meta.get(key)
+    ]
+    if differences:
+        warnings.warn("Baseline recorded on a different setup: "
+                      + ", ".join(differences))
+
+    regressions = []
+    for name, timings in current["results"].items():
+        for size, timing in timings.items():
+            base = baseline["results"].get(name, {}).get(size, {})
+            if timing["seconds"] is None or base.get("seconds") is None:
+                continue
+            ratio = timing["seconds"] / base["seconds"]
+            if ratio > 1 + threshold:
+                regressions.append((name, size, ratio))
+    return regressions
+
+
+def load(path):
+    with open(path, "r") as infile:
+        return json.load(infile)
+
+
+def save(results, path):
+    with open(path, "w") as outfile:
+        json.dump(results, outfile, indent=4)
@@ -1,9 +1,12 @@
 import os
 import click
+import csv
 import json
-from collections import namedtuple
+import numpy as np
 
-from uhb import analytical as a, psi as p, ramberg as r
+from uhb import analytical as a, benchmark as b, instrument, psi as p, ramberg as r
+from uhb.api import convert, load_data
+from uhb import fs2000, loadcases, stiffness, sweep as sw
 
 
 # import util.psi as s
@@ -14,17 +17,24 @@ PROJECT_ROOT = os.path.join(HERE, os.pardir)
 TEST_PATH = os.path.join(PROJECT_ROOT, 'tests')
 
 
-def convert(dictionary):
-    """Convert a dictionary to a named tuple."""
-    return namedtuple('Data', dictionary.keys())(**dictionary)
+def print_profile():
+    """Print the instrumentation report as JSON and stop instrumenting."""
+    click.echo(instrument.to_json(), err=True)
+    instrument.disable()
 
 
 @click.group()
 @click.pass_context
-def main(data):
-    with open("data.json", "r") as input_file:
-        input_dict = json.load(input_file)
-        data.obj = convert(input_dict)
+@click.option("--profile", is_flag=True,
+              help="Print per-stage timings and solver counts as JSON.")
+def main(data, profile):
+    if profile:
+        instrument.reset()
+        instrument.enable()
+        data.call_on_close(print_profile)
+
+    with instrument.stage("cli.load_data"):
+        data.obj = load_data("data.json")
 
 
 @main.command()
@@ -52,6 +62,30 @@ def anal(data):
     click.secho(f"{results.H}", fg="green")
 
 
+@main.command("load-cases")
+@click.pass_context
+@click.option("--states", "-s", type=click.File("r"),
+              help="JSON list of states with name, rho_cont, P_i and T.")
+@click.option("--test-pressure", type=float,
+              help="Hydrotest pressure [Pa] of the default states.")
+def load_cases(data, states, test_pressure):
+    """ Calculate the required soil cover height for each operating state.
+    """
+    if states:
+        states = [loadcases.State(**state) for state in json.load(states)]
+    else:
+        states = loadcases.default_states(data.obj, test_pressure)
+    results = loadcases.run_load_cases(data.obj, states)
+
+    click.secho("State | EAF [N] | w_o [N/m] | q [N/m] | H [m]", fg="yellow")
+    for i, name in enumerate(results.names):
+        click.secho(
+            f"{name} | {results.EAF[i]:.0f} | {results.w_o[i]:.2f} | "
+            f"{results.q[i]:.2f} | {results.H[i]:.3f}", fg="green")
+    click.secho(f"Governing State:")
+    click.secho(f"{results.names[results.governing]}", fg="green")
+
+
 @main.command()
 @click.pass_context
 @click.argument("cover_height", type=float)
@@ -90,3 +124,165 @@ def nonlinear(data):
     """
     rcs = r.nonlinear_rc(data.obj)
     click.secho(f"{rcs}", fg="green")
+
+
+@main.command()
+@click.pass_context
+@click.option(
+    "--sizes", "-s", default=",".join(str(n) for n in b.SIZES),
+    help="Comma separated batch sizes.",
+)
+@click.option("--case", "-c", "cases", multiple=True, help="Case to run.")
+@click.option("--baseline", "-b", type=click.Path(), default="benchmark.json")
+@click.option("--threshold", "-t", type=float, default=0.25,
+              help="Allowed fractional slowdown against the baseline.")
+@click.option("--budget", type=float, default=60.0,
+              help="Skip looped batches estimated to take longer [s].")
+@click.option("--save", is_flag=True, help="Save results as the baseline.")
+def bench(data, sizes, cases, baseline, threshold, budget, save):
+    """Benchmark the hot paths and check for regressions.
+    """
+    sizes = [int(n) for n in sizes.split(",")]
+    results = b.run_benchmarks(data.obj, sizes, cases, budget=budget)
+
+    for name, timings in results["results"].items():
+        click.secho(name, fg="yellow")
+        for size, timing in timings.items():
+            if timing["seconds"] is None:
+                click.secho(
+                    f"{size:>10} | {timing['mode']:>7} | "
+                    f"~{timing['estimate']:.3g} s", fg="red")
+                continue
+            exponent = timing.get("exponent")
+            click.secho(
+                f"{size:>10} | {timing['mode']:>7} | "
+                f"{timing['seconds']:.3e} s | {timing['per_item']:.3e} s/item"
+                + (f" | n^{exponent:.2f}" if exponent is not None else ""),
+                fg="green")
+
+    if save:
+        b.save(results, baseline)
+        click.secho(f"Baseline saved to {baseline}", fg="yellow")
+    elif os.path.exists(baseline):
+        regressions = b.compare(results, b.load(baseline), threshold)
+        for name, size, ratio in regressions:
+            click.secho(f"Regression: {name} @ {size}: {ratio:.2f}x", fg="red")
+        if regressions:
+            data.exit(1)
+
+
+@main.command()
+@click.pass_context
+@click.argument("output", type=click.Path())
+@click.option("--grid", "-g", multiple=True, required=True,
+              help="Input values as name=start:stop:num, e.g. T=20:80:61.")
+@click.option("--kernel", "-k", type=click.Choice(sorted(sw.KERNELS)),
+              default="analytical")
+@click.option("--chunk-size", type=int, default=100000,
+              help="Cases evaluated and checkpointed per chunk.")
+@click.option("--max-chunks", type=int, help="Stop after this many chunks.")
+def sweep(data, output, grid, kernel, chunk_size, max_chunks):
+    """ Run a resumable sweep over a grid of inputs into a results store.
+    """
+    values = {}
+    for spec in grid:
+        name, _, span = spec.partition("=")
+        try:
+            start, stop, num = span.split(":")
+            values[name] = np.linspace(float(start), float(stop), int(num))
+        except ValueError:
+            raise click.BadParameter(
+                f"{spec!r} is not name=start:stop:num.", param_hint="--grid")
+    try:
+        sw.check_grid(data.obj, values, kernel)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="--grid")
+
+    def progress(chunk_id, total):
+        click.secho(f"{sw.chunk_name(chunk_id)} / {total}", fg="green")
+
+    evaluated = sw.run(output, data.obj, values, kernel, chunk_size,
+                       max_chunks, progress)
+    remaining = sw.n_chunks(values, chunk_size) - len(sw.completed(output))
+    click.secho(f"{evaluated} chunks evaluated, {remaining} remaining",
+                fg="yellow")
+
+
+@main.command("stiffness-table")
+@click.pass_context
+@click.argument("output", type=click.Path())
+@click.option("--soils", type=click.Path(exists=True),
+              help="JSON of soil type to input overrides, e.g. gamma_s.")
+@click.option("--start", type=float, default=0.1, help="First cover height.")
+@click.option("--stop", type=float, default=0.5, help="Last cover height.")
+@click.option("--step", type=float, default=0.1, help="Cover height step.")
+@click.option("--format", "-f", "fmt",
+              type=click.Choice(["json", "csv", "npy"]), default="json")
+@click.option("--chunk-size", type=int, default=10000,
+              help="Cover heights evaluated per block.")
+def stiffness_table(data, output, soils, start, stop, step, fmt, chunk_size):
+    """ Write soil spring stiffnesses for soil types and cover heights.
+    """
+    if soils:
+        with open(soils, "r") as input_file:
+            overrides = json.load(input_file)
+        soils = {
+            soil_type: data.obj._replace(soil_type=soil_type, **fields)
+            for soil_type, fields in overrides.items()
+        }
+    else:
+        soils = {data.obj.soil_type: data.obj}
+
+    heights = stiffness.cover_heights(start, stop, step)
+    blocks = stiffness.iter_table(soils, heights, chunk_size)
+
+    if fmt == "npy":
+        stiffness.write_npy(output, blocks, len(soils) * len(heights))
+    else:
+        with open(output, "w", newline="") as outfile:
+            writer = {"json": stiffness.write_json, "csv": stiffness.write_csv}
+            writer[fmt](outfile, blocks)
+
+    click.secho(f"{len(soils) * len(heights)} rows written to {output}",
+                fg="green")
+
+
+@main.command("fs2000")
+@click.pass_context
+@click.argument("paths", nargs=-1, required=True,
+                type=click.Path(exists=True))
+@click.option("--cover", type=float,
+              help="Cover height [m] for decks without one in the title.")
+@click.option("--config", "-c", type=click.Path(exists=True), required=True,
+              help="Table layout and soil inputs of the decks, e.g. "
+              "fs2000/config.json.")
+@click.option("--processes", "-p", type=int,
+              help="Worker processes, 0 to compare in this process.")
+@click.option("--output", "-o", type=click.Path(),
+              help="Write the per-table comparisons to a CSV file.")
+def compare_fs2000(data, paths, cover, config, processes, output):
+    """ Compare FS2000 deck springs against psi springs.
+    """
+    decks = []
+    for path in paths:
+        decks += fs2000.find_decks(path) if os.path.isdir(path) else [path]
+    if cover is None:
+        decks = [d for d in decks if fs2000.parse_deck(d).cover is not None]
+
+    rows = fs2000.compare_decks(decks, data.obj, fs2000.load_config(config),
+                                cover, processes)
+
+    if output:
+        with open(output, "w", newline="") as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(fs2000.Comparison._fields)
+            writer.writerows(rows)
+
+    click.secho(f"{len(decks)} decks compared", fg="yellow")
+    click.secho("RC | direction | decks | mean | max abs | rms | curve",
+                fg="yellow")
+    for table, stats in fs2000.summary(rows).items():
+        click.secho(
+            f"{table:>2} | {stats['direction']:>9} | {stats['decks']:>5} | "
+            f"{stats['mean']:+.2%} | {stats['max_abs']:.2%} | "
+            f"{stats['rms']:.2%} | {stats['curve']:.2%}", fg="green")
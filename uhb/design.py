@@ -0,0 +1,179 @@
+""" Design module
+
+Inverse design for an available cover height: the smallest wall thickness,
+coating thickness or rock-dump height that provides the download required for
+stability. Every location is solved at once by a vectorised bracketed search.
+Trial wall thicknesses are bounded below by pressure containment and a minimum
+specific gravity, since a section that only just sinks needs almost no download
+and would otherwise be reported as the design.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from uhb import analytical, general, instrument, reliability
+
+
+Design = namedtuple("Design", "value feasible")
+
+
+def bisect(func, lo, hi, tol=1e-6, maxiter=100):
+    """ Returns the smallest x in [lo, hi] with func(x) >= 0, element-wise,
+    given func(lo) < 0 <= func(hi).
+    """
+    lo, hi = (np.array(x, dtype=float) for x in np.broadcast_arrays(lo, hi))
+    for _ in range(maxiter):
+        if np.all(hi - lo <= tol):
+            break
+        mid = (lo + hi) / 2
+        ok = func(mid) >= 0
+        lo, hi = np.where(ok, lo, mid), np.where(ok, mid, hi)
+    return hi
+
+
+def golden_maximum(func, lo, hi, maxiter=60):
+    """ Returns the x in [lo, hi] maximising func, element-wise, by golden
+    section search; func should be unimodal over the bracket.
+    """
+    ratio = (5 ** 0.5 - 1) / 2
+    lo, hi = (np.array(x, dtype=float) for x in np.broadcast_arrays(lo, hi))
+    for _ in range(maxiter):
+        a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+        left = func(a) >= func(b)
+        lo, hi = np.where(left, lo, a), np.where(left, b, hi)
+    return (lo + hi) / 2
+
+
+def minimum_input(data, H, name, lo, hi, model="f110", n_scan=16, tol=1e-6):
+    """ Returns the smallest value of the named input in [lo, hi] for which
+    cover height H [m] provides the required uplift resistance.
+
+    The bracket is scanned at n_scan points to find the first feasible
+    interval, which is then bisected, so the margin need not be monotonic
+    over the whole bracket. Where no scan point is feasible, the margin is
+    maximised between the neighbours of the best scan point, so a feasible
+    window narrower than the scan spacing is still found. Locations with no
+    feasible point are flagged infeasible and their value is nan; a feasible
+    value always satisfies the margin.
+    """
+    def margin(x):
+        # Buoyant trial sections give a nan margin and count as infeasible
+        with np.errstate(invalid="ignore"):
+            g = reliability.limit_state(
+                analytical.replace_inputs(data, {name: x}), H, model)
+        return np.where(np.isnan(g), -np.inf, g)
+
+    with instrument.stage("design.search"):
+        lo, hi = np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+        ndim = np.ndim(margin(lo + 0 * hi))
+        fractions = np.linspace(0, 1, n_scan).reshape((-1,) + (1,) * ndim)
+        scan = lo + fractions * (hi - lo)
+        margins = margin(scan)
+        scan, margins = np.broadcast_arrays(scan, margins)
+        ok = margins >= 0
+
+        feasible = ok.any(axis=0)
+        first = np.argmax(ok, axis=0)
+
+        def take(index):
+            index = np.clip(index, 0, n_scan - 1)[np.newaxis]
+            return np.take_along_axis(scan, index, axis=0)[0]
+
+        upper, lower = take(first), take(first - 1)
+
+        best = np.argmax(margins, axis=0)
+        peak = golden_maximum(margin, take(best - 1), take(best + 1))
+        found = ~feasible & (margin(peak) >= 0)
+        upper = np.where(found, peak, upper)
+        lower = np.where(found, take(best - 1), lower)
+
+        value = bisect(margin, lower, upper, tol)
+        value = np.where(feasible & (first == 0), lower, value)
+        feasible = feasible | found
+        value = np.where(feasible, value, np.nan)
+
+    return Design(value[()], feasible[()])
+
+
+def specific_gravity(data):
+    """ Returns the specific gravity of the pipe section with contents.
+    """
+    D_o = general.total_outside_diameter(data.D, data.t_coat)
+    w_o = general.submerged_weight(
+        data.D, data.t, data.t_coat, data.rho_p, data.rho_coat, data.rho_cont,
+        data.rho_sw, data.g)
+    return 1 + w_o / (data.g * data.rho_sw * general.total_area(D_o))
+
+
+def hoop_thickness(data, design_factor=0.72):
+    """ Returns the wall thickness [m] for pressure containment, from the
+    Barlow hoop stress at design_factor times SMYS.
+    """
+    return (data.P_i - data.P_e) * data.D / (2 * design_factor * data.SMYS)
+
+
+def buoyancy_thickness(data, min_sg=1.1):
+    """ Returns the wall thickness [m] giving a specific gravity of min_sg.
+    """
+    return bisect(
+        lambda t: specific_gravity(data._replace(t=t)) - min_sg,
+        0 * np.asarray(data.D), np.asarray(data.D) / 2, tol=1e-9)[()]
+
+
+def minimum_wall_thickness(data, H, lo=None, hi=None, min_sg=1.1,
+                           design_factor=0.72, **kwargs):
+    """ Returns the smallest wall thickness [m] for cover height H [m], no
+    less than the pressure containment and minimum specific gravity
+    thicknesses (data needs SMYS). The upper bound defaults to a quarter of
+    the outside diameter.
+    """
+    bound = np.maximum(hoop_thickness(data, design_factor),
+                       buoyancy_thickness(data, min_sg))
+    lo = bound if lo is None else np.maximum(lo, bound)
+    hi = data.D / 4 if hi is None else hi
+    return minimum_input(data, H, "t", lo, hi, **kwargs)
+
+
+def minimum_coating_thickness(data, H, lo=0.0, hi=0.2, **kwargs):
+    """ Returns the smallest (e.g. concrete) coating thickness [m], of density
+    rho_coat, for cover height H [m].
+    """
+    return minimum_input(data, H, "t_coat", lo, hi, **kwargs)
+
+
+def layered_cover_resistance(H, h_r, D, gamma, f, gamma_r, f_r):
+    """ Returns the uplift resistance [N/m] of sand cover H [m] under a rock
+    layer of height h_r [m], of unit weight gamma_r and uplift factor f_r.
+
+    DNV-RP-F110 Equation (B.3) with the vertical slip surfaces carried
+    through both layers; h_r = 0 gives psi.R_max.
+    """
+    return (D * (gamma * H + gamma_r * h_r) + f_r * gamma_r * h_r ** 2
+            + f * (2 * gamma_r * h_r * H + gamma * H ** 2))
+
+
+def rock_dump_height(data, H, gamma_r, f_r, hi=5.0, tol=1e-6):
+    """ Returns the rock-dump height [m] over the available sand cover H [m]
+    to provide the required uplift resistance, for rock of (submerged) unit
+    weight gamma_r [N/m^3] and uplift factor f_r. Locations needing more
+    than hi are infeasible.
+    """
+    if np.any(np.asarray(data.c) > 0):
+        raise ValueError("Rock dump design needs a cohesionless cover.")
+    download = analytical.stability_download(data)
+    required = np.maximum(download.w - download.w_o, 0)
+
+    def margin(h_r):
+        return layered_cover_resistance(
+            H, h_r, download.D_tot, data.gamma_s, data.f, gamma_r,
+            f_r) - required
+
+    with instrument.stage("design.search"):
+        shape = np.broadcast(H, required, hi).shape
+        lo, hi = np.zeros(shape), np.broadcast_to(hi, shape)
+        value = np.where(margin(lo) >= 0, 0, bisect(margin, lo, hi, tol))
+        feasible = margin(hi) >= 0
+        value = np.where(feasible, value, np.nan)
+
+    return Design(value[()], feasible[()])
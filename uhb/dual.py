@@ -0,0 +1,293 @@
+""" Forward-mode automatic differentiation module
+
+A Dual carries a value and its derivatives with respect to k seeded inputs.
+Values may be NumPy arrays, so derivatives for every case of a vectorised
+evaluation come out of a single pass. The derivatives are stored with the
+seed direction as the leading axis, i.e. der.shape == (k,) + val.shape.
+"""
+
+import numpy as np
+
+
+def _lift(der, val_ndim, ndim):
+    """ Reshapes a derivative so that it broadcasts against ndim values.
+    """
+    lead = (1,) * (ndim - val_ndim)
+    return der.reshape(der.shape[:1] + lead + der.shape[1:])
+
+
+def _parts(x):
+    if isinstance(x, Dual):
+        return x.val, x.der
+    return x, None
+
+
+class Dual:
+
+    __array_priority__ = 100
+
+    def __init__(self, val, der):
+        self.val = np.asarray(val, dtype=float)
+        self.der = np.asarray(der, dtype=float)
+
+    def __repr__(self):
+        return f"Dual({self.val!r}, {self.der!r})"
+
+    @property
+    def k(self):
+        return self.der.shape[0]
+
+    @property
+    def shape(self):
+        return self.val.shape
+
+    def __len__(self):
+        return len(self.val)
+
+    def __getitem__(self, index):
+        if not isinstance(index, tuple):
+            index = (index,)
+        return Dual(self.val[index], self.der[(slice(None),) + index])
+
+    # Chain rule
+
+    @staticmethod
+    def _combine(val, a, da, b, db):
+        """ Returns a Dual with value val and derivative da * a' + db * b'.
+        """
+        ndim = np.ndim(val)
+        der = 0
+        for x, dx in ((a, da), (b, db)):
+            if isinstance(x, Dual):
+                der = der + _lift(x.der, x.val.ndim, ndim) * dx
+        shape = np.shape(der)[:1] + np.shape(val)
+        return Dual(val, np.broadcast_to(der, shape))
+
+    def __add__(self, other):
+        b, _ = _parts(other)
+        return self._combine(self.val + b, self, 1, other, 1)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        b, _ = _parts(other)
+        return self._combine(self.val - b, self, 1, other, -1)
+
+    def __rsub__(self, other):
+        return self._combine(other - self.val, self, -1, None, 0)
+
+    def __mul__(self, other):
+        b, _ = _parts(other)
+        return self._combine(self.val * b, self, b, other, self.val)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        b, _ = _parts(other)
+        val = self.val / b
+        return self._combine(val, self, 1 / b, other, -val / b)
+
+    def __rtruediv__(self, other):
+        val = other / self.val
+        return self._combine(val, self, -val / self.val, None, 0)
+
+    def __pow__(self, other):
+        b, _ = _parts(other)
+        val = self.val ** b
+        if isinstance(other, Dual):
+            log_a = np.log(np.where(self.val > 0, self.val, 1))
+            return self._combine(
+                val, self, b * self.val ** (b - 1), other, val * log_a)
+        return self._combine(val, self, b * self.val ** (b - 1), None, 0)
+
+    def __rpow__(self, other):
+        val = other ** self.val
+        return self._combine(val, self, val * np.log(other), None, 0)
+
+    def __neg__(self):
+        return Dual(-self.val, -self.der)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self._combine(
+            np.abs(self.val), self, np.sign(self.val), None, 0)
+
+    # Comparisons act on the value only
+
+    def __lt__(self, other):
+        return self.val < _parts(other)[0]
+
+    def __le__(self, other):
+        return self.val <= _parts(other)[0]
+
+    def __gt__(self, other):
+        return self.val > _parts(other)[0]
+
+    def __ge__(self, other):
+        return self.val >= _parts(other)[0]
+
+    def __eq__(self, other):
+        return self.val == _parts(other)[0]
+
+    def __ne__(self, other):
+        return self.val != _parts(other)[0]
+
+    __hash__ = None
+
+    def __float__(self):
+        return float(self.val)
+
+    # NumPy protocols
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        if ufunc in _BINARY:
+            return _BINARY[ufunc](*inputs)
+        if ufunc in _UNARY:
+            (x,) = inputs
+            val = ufunc(x.val)
+            return self._combine(val, x, _UNARY[ufunc](x.val, val), None, 0)
+        if ufunc in _COMPARISONS:
+            return ufunc(*(_parts(x)[0] for x in inputs))
+        return NotImplemented
+
+    def __array_function__(self, func, types, args, kwargs):
+        if func not in _FUNCTIONS:
+            return NotImplemented
+        return _FUNCTIONS[func](*args, **kwargs)
+
+
+def _minimum(a, b):
+    a_val, b_val = _parts(a)[0], _parts(b)[0]
+    return where(a_val <= b_val, a, b)
+
+
+def _maximum(a, b):
+    a_val, b_val = _parts(a)[0], _parts(b)[0]
+    return where(a_val >= b_val, a, b)
+
+
+_BINARY = {
+    np.add: lambda a, b: Dual.__add__(a, b) if isinstance(a, Dual)
+    else Dual.__radd__(b, a),
+    np.subtract: lambda a, b: Dual.__sub__(a, b) if isinstance(a, Dual)
+    else Dual.__rsub__(b, a),
+    np.multiply: lambda a, b: Dual.__mul__(a, b) if isinstance(a, Dual)
+    else Dual.__rmul__(b, a),
+    np.true_divide: lambda a, b: Dual.__truediv__(a, b) if isinstance(a, Dual)
+    else Dual.__rtruediv__(b, a),
+    np.power: lambda a, b: Dual.__pow__(a, b) if isinstance(a, Dual)
+    else Dual.__rpow__(b, a),
+    np.minimum: _minimum,
+    np.maximum: _maximum,
+}
+
+_UNARY = {
+    np.negative: lambda x, y: -1,
+    np.absolute: lambda x, y: np.sign(x),
+    np.sin: lambda x, y: np.cos(x),
+    np.cos: lambda x, y: -np.sin(x),
+    np.tan: lambda x, y: 1 + y ** 2,
+    np.exp: lambda x, y: y,
+    np.log: lambda x, y: 1 / x,
+    np.log10: lambda x, y: 1 / (x * np.log(10)),
+    np.sqrt: lambda x, y: 0.5 / y,
+    np.square: lambda x, y: 2 * x,
+    np.radians: lambda x, y: np.pi / 180,
+    np.deg2rad: lambda x, y: np.pi / 180,
+}
+
+_COMPARISONS = {
+    np.less, np.less_equal, np.greater, np.greater_equal, np.equal,
+    np.not_equal,
+}
+
+
+def where(condition, a, b):
+    """ Dual aware numpy.where.
+    """
+    a_val, a_der = _parts(a)
+    b_val, b_der = _parts(b)
+    val = np.where(condition, a_val, b_val)
+    if a_der is None and b_der is None:
+        return val
+    k = (a_der if a_der is not None else b_der).shape[0]
+    ndim = np.ndim(val)
+
+    def der(x_val, x_der):
+        if x_der is None:
+            return np.zeros((k,) + (1,) * ndim)
+        return _lift(x_der, np.ndim(x_val), ndim)
+
+    return Dual(val, np.broadcast_to(
+        np.where(condition, der(a_val, a_der), der(b_val, b_der)),
+        (k,) + np.shape(val)))
+
+
+def interp(x, xp, fp, left=None, right=None):
+    """ Dual aware numpy.interp for a Dual x and constant xp, fp. The
+    derivative is the slope of the interpolated segment and zero outside the
+    range of xp.
+    """
+    x_val, x_der = _parts(x)
+    val = np.interp(x_val, xp, fp, left, right)
+    if x_der is None:
+        return val
+    xp, fp = np.asarray(xp, dtype=float), np.asarray(fp, dtype=float)
+    slopes = np.diff(fp) / np.diff(xp)
+    i = np.clip(np.searchsorted(xp, x_val, side="right") - 1,
+                0, len(slopes) - 1)
+    inside = (x_val >= xp[0]) & (x_val <= xp[-1])
+    return Dual(val, x_der * np.where(inside, slopes[i], 0))
+
+
+_FUNCTIONS = {
+    np.where: where,
+    np.interp: interp,
+    np.shape: lambda x: x.shape,
+    np.ndim: lambda x: x.val.ndim,
+}
+
+
+def value(x):
+    """ Returns the value of a Dual, or x itself.
+    """
+    return x.val if isinstance(x, Dual) else x
+
+
+def derivatives(x, k):
+    """ Returns the derivatives of a Dual, or zeros for a constant.
+    """
+    if isinstance(x, Dual):
+        return x.der
+    return np.zeros((k,) + np.shape(x))
+
+
+def seed(values):
+    """ Returns a dictionary of Duals, one unit seed direction per input.
+    """
+    k = len(values)
+    seeded = {}
+    for i, (name, val) in enumerate(values.items()):
+        val = np.asarray(val, dtype=float)
+        der = np.zeros((k,) + val.shape)
+        der[i] = 1
+        seeded[name] = Dual(val, der)
+    return seeded
+
+
+def implicit(residual, root, *args):
+    """ Returns the root of residual(x, *args) == 0 as a Dual, given its
+    solved value, by the implicit function theorem dx/dp = -(dr/dp) / (dr/dx).
+    """
+    duals = [a for a in args if isinstance(a, Dual)]
+    if not duals:
+        return root
+    k = duals[0].k
+    r_p = residual(root, *args)
+    x = Dual(root, np.ones((1,) + np.shape(root)))
+    r_x = residual(x, *(value(a) for a in args))
+    return Dual(root, -derivatives(r_p, k) / r_x.der[0])
@@ -1,6 +1,12 @@
-import matplotlib.pyplot as plt
+import os
+
 import numpy as np
 
+from uhb import instrument, plotting
+
+
+OUTPUT_DIR = os.path.join("outputs", "imperfections")
+
 
 def natural_wavelength(gamma_factor, E, I, delta_f, W_sub):
     """Return the factored natural wavelength [m] i.e. the distance from prop to
@@ -24,26 +30,30 @@ def foundation_profile(x, delta_f, L_o):
     return delta_f * (x / L_o) ** 3 * (4 - 3 * x / L_o)
 
 
-def plot_wavelength(xs, w_fs, L_o):
-    fig, ax = plt.subplots()
-    ax.plot(xs, w_fs, marker="o")
-    ax.set_title(f"Foundation Profile, L_o = {L_o:.2f} m")
-    ax.set_xlabel("x [m]")
-    ax.set_ylabel("Foundation Profile [m]")
-    ax.grid()
-    fig.tight_layout()  # otherwise the right y-label is slightly clipped
-    fig.savefig("outputs/imperfections/foundation_profile.png")
+def profile_path(delta_f, directory=OUTPUT_DIR):
+    return os.path.join(directory, f"foundation_profile_{delta_f:.1f}m.png")
 
 
-def write_results(profile, delta_f):
-    with open(
-        f"outputs/imperfections/foundation_profile_{delta_f:.1f}m.txt", "w"
-    ) as outfile:
+@instrument.timed("foundation.plot_wavelength")
+def plot_wavelength(xs, w_fs, L_o,
+                    path=os.path.join(OUTPUT_DIR, "foundation_profile.png")):
+    plotting.render_many([plotting.Job("profile", path, (xs, w_fs, L_o))],
+                         processes=0)
+
+
+@instrument.timed("foundation.write_results")
+def write_results(profile, delta_f, directory=OUTPUT_DIR):
+    path = os.path.join(directory, f"foundation_profile_{delta_f:.1f}m.txt")
+    with open(path, "w") as outfile:
         for x in profile[::-1]:
             outfile.write(f"{x[0]:.1f}, {x[1]:.4f}\n")
 
 
-def main(element_length, pipe):
+def main(element_length, pipe, plot=True, processes=0, directory=OUTPUT_DIR):
+    """Write and plot the foundation profiles for a range of imperfection
+    heights to directory. Plots are rendered together at the end, in worker
+    processes if processes is not 0, and skipped if plot is False.
+    """
     E = pipe["E"]
     I = pipe["I"]
     W_sub = pipe["W_sub"]
@@ -51,20 +61,26 @@ def main(element_length, pipe):
 
     print("delta_f [m]: L_o [m]")
 
+    jobs = []
     for delta_f in np.arange(0.1, 0.6, 0.1):
 
         L_o = natural_wavelength(gamma_factor, E, I, delta_f, W_sub)
 
         print(f"{delta_f:.1f}: {L_o:.3f}")
 
-        xs = np.arange(0, L_o, element_length)
-        w_fs = [foundation_profile(x, delta_f, L_o) for x in xs]
+        with instrument.stage("foundation.profile"):
+            xs = np.arange(0, L_o, element_length)
+            w_fs = foundation_profile(xs, delta_f, L_o)
 
         profile = np.stack((xs, w_fs), axis=-1)
 
-        plot_wavelength(xs, w_fs, L_o)
+        jobs.append(plotting.Job("profile", profile_path(delta_f, directory),
+                                 (xs, w_fs, L_o)))
+
+        write_results(profile, delta_f, directory)
 
-        write_results(profile, delta_f)
+    with instrument.stage("foundation.plot"):
+        plotting.render_many(jobs, processes, plot=plot)
 
 
 if __name__ == "__main__":
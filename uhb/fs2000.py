@@ -0,0 +1,236 @@
+""" FS2000 comparison module
+
+Parses the soil spring RC (resistance curve) tables of FS2000 decks and
+compares each whole curve with the psi spring built from the same inputs,
+deck by deck in a pool of worker processes, with relative differences per
+table and summary statistics per table across decks.
+
+Which spring each table holds, how it is scaled and the soil inputs are set
+by a configuration (see fs2000/config.json); pipe inputs are read from the
+PIPE, GTABP and MTAB lines of a deck. write_deck writes the RC tables psi
+gives for a configuration, so decks generated from matching inputs compare
+with near-zero differences.
+"""
+
+import glob
+import json
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from uhb import general, psi
+
+
+Deck = namedtuple("Deck", "path title cover tables inputs")
+
+Comparison = namedtuple(
+    "Comparison",
+    "deck table direction fs2000_disp uhb_disp disp_diff "
+    "fs2000_force uhb_force force_diff curve_diff",
+)
+
+GENERATORS = {
+    "uplift": psi.gen_uplift_spring,
+    "lateral": psi.gen_lateral_spring,
+    "bearing": psi.gen_bearing_spring,
+    "axial": psi.gen_axial_spring,
+}
+
+# Deck line keyword to (field position, input name) of the pipe inputs
+INPUT_FIELDS = {
+    "PIPE": ((1, "D"), (2, "t")),
+    "GTABP": ((5, "t_coat"), (6, "rho_coat")),
+    "MTAB": ((2, "E"), (4, "v"), (5, "rho_p"), (6, "alpha"), (7, "SMYS")),
+}
+
+COVER = re.compile(r"cover height\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+def load_config(path):
+    """ Returns a comparison configuration from a JSON file.
+    """
+    with open(path, "r") as infile:
+        return json.load(infile)
+
+
+def parse_deck(path):
+    """ Returns the title, cover height [m], RC tables and pipe inputs of a
+    deck. Tables map the table number to a list of (displacement, force)
+    points; a repeated RC line continues a table only if its displacements
+    follow on. The cover height is read from a "Cover Height<mm>" title and
+    is None otherwise.
+    """
+    title, tables, inputs = "", {}, {}
+    with open(path, "r") as infile:
+        for line in infile:
+            fields = [f.strip() for f in line.split(",")]
+            keyword = fields[0].upper()
+            if keyword == "TITLE":
+                title = ",".join(fields[1:])
+            elif keyword == "RC":
+                values = [float(f) for f in fields[2:] if f]
+                line_points = list(zip(values[::2], values[1::2]))
+                points = tables.setdefault(int(fields[1]), [])
+                if not points or line_points[0][0] > points[-1][0]:
+                    points.extend(line_points)
+            for position, name in INPUT_FIELDS.get(keyword, ()):
+                inputs[name] = float(fields[position])
+    match = COVER.search(title)
+    cover = float(match.group(1)) / 1000 if match else None
+    return Deck(path, title, cover, tables, inputs)
+
+
+def table_data(data, config, spec, inputs=None):
+    """ Returns data with the deck pipe inputs, the configuration soil inputs
+    and the table inputs, in increasing precedence. Inputs data does not
+    hold, e.g. SMYS for the springs, are ignored.
+    """
+    values = dict(inputs or {})
+    values.update(config.get("inputs", {}))
+    values.update(spec.get("inputs", {}))
+    return data._replace(
+        **{k: v for k, v in values.items() if k in data._fields})
+
+
+def uhb_curve(data, h, spec):
+    """ Returns the psi spring matching an FS2000 table spec at cover height
+    h [m] as arrays of displacement and force, held constant beyond the last
+    point.
+
+    FS2000 carries the pipe weight and cover weight separately, so the
+    uplift curve is net of the soil weight above the pipe and falls to minus
+    that weight once the pipe has risen by the cover height.
+    """
+    direction = spec["direction"]
+    D_o = general.total_outside_diameter(data.D, data.t_coat)
+    # A deck measuring cover to the pipe centre uses it as the depth H
+    h_model = h - D_o / 2 if spec.get("datum", "top") == "centre" else h
+    disp, force = GENERATORS[direction](
+        data, h_model, spec.get("model", "asce"))
+    disp = spec.get("disp", disp)
+    scale = spec.get("scale", 1)
+
+    if direction == "uplift":
+        weight = psi.calculate_soil_weight(
+            data.gamma_s, D_o, psi.depth_to_centre(D_o, h_model))
+        return (np.array([0, disp, max(h, disp)]),
+                scale * np.array([0, force - weight, -weight]))
+    return np.array([0, disp]), scale * np.array([0, force])
+
+
+def _relative(uhb, fs2000):
+    return (uhb - fs2000) / fs2000 if fs2000 else float("nan")
+
+
+def compare_curves(fs2000_points, uhb_disp, uhb_force):
+    """ Returns the largest difference between the curves, over the
+    displacements of either up to the end of the FS2000 table, relative to
+    the largest FS2000 force.
+    """
+    fs2000_disp, fs2000_force = (
+        np.array([0] + [p[i] for p in fs2000_points]) for i in (0, 1))
+    xs = np.union1d(fs2000_disp, uhb_disp)
+    xs = xs[xs <= fs2000_disp[-1]]
+    difference = (np.interp(xs, uhb_disp, uhb_force)
+                  - np.interp(xs, fs2000_disp, fs2000_force))
+    return float(np.max(np.abs(difference)) / np.max(np.abs(fs2000_force)))
+
+
+def compare_deck(path, data, config, cover=None, pipe_inputs=None):
+    """ Returns a Comparison of every configured RC table of a deck. cover
+    [m] overrides the cover height read from the title and pipe_inputs, e.g.
+    from another deck, are overridden by those of this deck.
+    """
+    deck = parse_deck(path)
+    h = deck.cover if cover is None else cover
+    if h is None:
+        raise ValueError(f"No cover height for {path}.")
+    inputs = dict(pipe_inputs or {}, **deck.inputs)
+
+    rows = []
+    for table, points in sorted(deck.tables.items()):
+        spec = config["tables"].get(str(table))
+        if spec is None:
+            continue
+        disp, force = uhb_curve(
+            table_data(data, config, spec, inputs), h, spec)
+        fs2000_disp, fs2000_force = points[0]
+        rows.append(Comparison(
+            os.path.basename(path), table, spec["direction"],
+            fs2000_disp, float(disp[1]), _relative(disp[1], fs2000_disp),
+            fs2000_force, float(force[1]), _relative(force[1], fs2000_force),
+            compare_curves(points, disp, force),
+        ))
+    return rows
+
+
+def write_deck(path, data, h, config, title=None):
+    """ Writes a deck of the psi RC tables of a configuration at cover
+    height h [m].
+    """
+    title = title or f"UHB Cover Height{h * 1000:.0f}"
+    with open(path, "w") as outfile:
+        outfile.write(f"TITLE,{title}\n")
+        for table, spec in config["tables"].items():
+            disp, force = uhb_curve(table_data(data, config, spec), h, spec)
+            points = list(zip(disp[1:], force[1:])) + [(100, force[-1])]
+            outfile.write(f"RC, {table}, " + ", ".join(
+                f"{float(d)!r}, {float(f)!r}" for d, f in points) + "\n")
+
+
+def _compare(args):
+    # Data namedtuples are built at run time and cannot be pickled, so the
+    # inputs travel to the workers as a dictionary
+    path, inputs, config, cover, pipe_inputs = args
+    data = namedtuple("Data", inputs)(**inputs)
+    return compare_deck(path, data, config, cover, pipe_inputs)
+
+
+def compare_decks(paths, data, config, cover=None, processes=None):
+    """ Returns the comparisons of all decks, compared in worker processes
+    (processes=0 compares in this process). Pipe inputs are read from the
+    configuration's pipe_deck, relative to the directory of each deck.
+    """
+    tasks = []
+    for path in paths:
+        pipe_deck = config.get("pipe_deck")
+        pipe_path = os.path.join(os.path.dirname(path), pipe_deck or "")
+        pipe_inputs = (parse_deck(pipe_path).inputs
+                       if pipe_deck and os.path.isfile(pipe_path) else {})
+        tasks.append((path, data._asdict(), config, cover, pipe_inputs))
+    if processes == 0:
+        results = map(_compare, tasks)
+        return [row for rows in results for row in rows]
+    with ProcessPoolExecutor(processes) as pool:
+        results = pool.map(_compare, tasks, chunksize=max(
+            1, len(tasks) // (4 * (processes or os.cpu_count() or 1))))
+        return [row for rows in results for row in rows]
+
+
+def find_decks(directory):
+    """ Returns the FS2000 deck files in a directory.
+    """
+    return sorted(p for p in glob.glob(os.path.join(directory, "*.UMUHB*"))
+                  if os.path.isfile(p))
+
+
+def summary(rows):
+    """ Returns per table statistics of the relative peak force differences
+    and the largest whole curve difference.
+    """
+    stats = {}
+    for table in sorted({row.table for row in rows}):
+        table_rows = [row for row in rows if row.table == table]
+        diffs = np.array([row.force_diff for row in table_rows])
+        stats[table] = {
+            "direction": table_rows[0].direction,
+            "decks": len(diffs),
+            "mean": float(np.mean(diffs)),
+            "max_abs": float(np.max(np.abs(diffs))),
+            "rms": float(np.sqrt(np.mean(diffs ** 2))),
+            "curve": float(max(row.curve_diff for row in table_rows)),
+        }
+    return stats
@@ -39,5 +39,5 @@ def submerged_weight(D, t, t_coat, rho_p, rho_coat, rho_cont, rho_sw, g):
     A_e = total_area(D_o)
     A_s = area_of_steel(D, t)
     A_coat = area_of_coating(D, t_coat)
-    A_i = area_of_coating(D, t_coat)    
+    A_i = internal_area(D, t)
     return g * (A_s * rho_p + A_coat * rho_coat + A_i * rho_cont - A_e * rho_sw)
@@ -0,0 +1,110 @@
+""" Hobbs module
+
+Hobbs (1984) vertical upheaval buckling mode for a buried pipeline, treating
+the submerged weight plus the uplift resistance of the cover as an equivalent
+download. The buckle force, the pre-buckle force, the amplitude, the maximum
+moment and the safe temperature rise are evaluated over a dense array of
+buckle lengths for any number of cases at once, and the minimum of the
+temperature curve gives the critical temperature rise of each case.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from uhb import general, instrument, psi
+
+
+Curves = namedtuple("Curves", "L P P_0 amplitude moment delta_T")
+
+Critical = namedtuple("Critical", "delta_T L amplitude moment safe")
+
+# Buckle lengths [m] the curves are evaluated at by default
+LENGTHS = np.linspace(5, 500, 2000)
+
+
+def buckle_force(E, I, L):
+    """ Returns the axial force in the buckle [N].
+    """
+    return 80.76 * E * I / L ** 2
+
+
+def prebuckle_force(E, I, A, w, phi_a, L):
+    """ Returns the axial force remote from the buckle [N], with axial
+    friction coefficient phi_a on the equivalent download w [N/m].
+    """
+    slip = (1 + 1.597e-5 * E * A * w * L ** 5 / (phi_a * (E * I) ** 2)) ** 0.5
+    return buckle_force(E, I, L) + phi_a * w * L * (slip - 1)
+
+
+def amplitude(E, I, w, L):
+    """ Returns the buckle amplitude [m].
+    """
+    return 2.408e-3 * w * L ** 4 / (E * I)
+
+
+def maximum_moment(w, L):
+    """ Returns the maximum bending moment in the buckle [Nm].
+    """
+    return 0.06938 * w * L ** 2
+
+
+def _case(value):
+    # Per case values gain a trailing axis to broadcast against the lengths
+    return np.asarray(value, dtype=float)[..., np.newaxis]
+
+
+@instrument.timed("hobbs.mode_curves")
+def mode_curves(data, h, L=LENGTHS, model="f110", phi_a=0.5):
+    """ Returns the Curves of cover heights h [m] over buckle lengths L [m].
+
+    Inputs in data and h may be arrays of cases, giving curves of shape
+    cases + L.shape. The safe temperature rise delta_T [deg C] is the rise
+    whose restrained effective axial force, with the pressure term of
+    general.effective_axial_force, equals the pre-buckle force.
+    """
+    D, t, E = data.D, data.t, data.E
+    I = general.second_moment_of_area(D, t)
+    A_s = general.area_of_steel(D, t)
+    A_i = general.internal_area(D, t)
+    w_o = general.submerged_weight(
+        D, t, data.t_coat, data.rho_p, data.rho_coat, data.rho_cont,
+        data.rho_sw, data.g)
+    _, q = psi.gen_uplift_spring(data, h, model)
+    pressure = (data.P_i - data.P_e) * A_i * (1 - 2 * data.v)
+
+    E, I, A_s, w = _case(E), _case(I), _case(A_s), _case(w_o + q)
+    L = np.asarray(L, dtype=float)
+    P_0 = prebuckle_force(E, I, A_s, w, phi_a, L)
+    delta_T = (P_0 - _case(pressure)) / (E * A_s * _case(data.alpha))
+    shape = P_0.shape
+    return Curves(
+        np.broadcast_to(L, shape),
+        np.broadcast_to(buckle_force(E, I, L), shape), P_0,
+        np.broadcast_to(amplitude(E, I, w, L), shape),
+        np.broadcast_to(maximum_moment(w, L), shape), delta_T,
+    )
+
+
+def critical_temperature(data, h, L=LENGTHS, model="f110", phi_a=0.5):
+    """ Returns the Critical minimum safe temperature rise [deg C] of each
+    case, with the buckle length, amplitude and moment it occurs at and
+    whether it exceeds the design temperature rise T - T_a.
+
+    L must span the minimum of the curve; a case whose minimum falls at
+    either end of L has no critical temperature within it, so its values
+    are nan and it is not safe.
+    """
+    curves = mode_curves(data, h, L, model, phi_a)
+    i = np.argmin(curves.delta_T, axis=-1)[..., np.newaxis]
+    interior = (i > 0) & (i < curves.delta_T.shape[-1] - 1)
+
+    def pick(values):
+        values = np.take_along_axis(values, i, axis=-1)
+        return np.where(interior, values, np.nan)[..., 0][()]
+
+    delta_T = pick(curves.delta_T)
+    with np.errstate(invalid="ignore"):
+        safe = delta_T >= data.T - data.T_a
+    return Critical(delta_T, pick(curves.L), pick(curves.amplitude),
+                    pick(curves.moment), safe)
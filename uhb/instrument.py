@@ -0,0 +1,128 @@
+""" Instrumentation module
+
+Opt-in wall time and call counts per stage plus named event counters (e.g.
+root-solver evaluations and failures). Everything is a no-op until enable() is
+called.
+"""
+
+import json
+import threading
+import time
+from functools import wraps
+
+
+_enabled = False
+_lock = threading.Lock()
+_stages = {}
+_counters = {}
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+
+def _record(name, seconds):
+    with _lock:
+        calls, total = _stages.get(name, (0, 0.0))
+        _stages[name] = (calls + 1, total + seconds)
+
+
+def count(name, n=1):
+    """ Increments the named counter by n.
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+class _Stage:
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        _record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullStage:
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name):
+    """ Returns a context manager timing the enclosed block as a stage.
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def timed(name):
+    """ Decorator timing every call of the function as a stage.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def report():
+    """ Returns the recorded stages and counters as a dictionary.
+    """
+    with _lock:
+        stages = {
+            name: {"calls": calls, "seconds": total, "mean": total / calls}
+            for name, (calls, total) in sorted(_stages.items())
+        }
+        counters = dict(sorted(_counters.items()))
+    return {"stages": stages, "counters": counters}
+
+
+def to_json(path=None):
+    """ Returns the report as a JSON string, writing it to path if given.
+    """
+    text = json.dumps(report(), indent=4)
+    if path is not None:
+        with open(path, "w") as outfile:
+            outfile.write(text)
+    return text
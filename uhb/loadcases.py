@@ -0,0 +1,97 @@
+""" Load cases module
+
+Required cover height for several operating states at once, e.g.
+installation (empty), flooded, hydrotest and operating. A state sets the
+contents density, internal pressure and temperature; the section properties
+and empty submerged weight do not depend on the state, so they are computed
+once per location and broadcast against a leading state axis. The governing
+state at each location is the one needing the most cover.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from uhb import analytical, general, instrument
+
+
+State = namedtuple("State", "name rho_cont P_i T")
+
+Section = namedtuple("Section", "D_tot A_i A_s I w_empty")
+
+LoadCases = namedtuple(
+    "LoadCases", "names EAF w_o w q H governing H_max")
+
+
+def default_states(data, P_test=None):
+    """ Returns installation, flooded, hydrotest and operating states, the
+    hydrotest at P_test [Pa] (1.25 times the operating pressure by default).
+    """
+    P_test = 1.25 * data.P_i if P_test is None else P_test
+    return [
+        State("installation", 0, data.P_e, data.T_a),
+        State("flooded", data.rho_sw, data.P_e, data.T_a),
+        State("hydrotest", data.rho_sw, P_test, data.T_a),
+        State("operating", data.rho_cont, data.P_i, data.T),
+    ]
+
+
+def section_properties(data):
+    """ Returns the state independent Section of the pipe.
+    """
+    D, t = data.D, data.t
+    return Section(
+        general.total_outside_diameter(D, data.t_coat),
+        general.internal_area(D, t),
+        general.area_of_steel(D, t),
+        general.second_moment_of_area(D, t),
+        general.submerged_weight(D, t, data.t_coat, data.rho_p,
+                                 data.rho_coat, 0, data.rho_sw, data.g),
+    )
+
+
+def _stack(states, field, shape):
+    # A leading state axis, each state broadcast to the location shape
+    return np.stack([np.broadcast_to(np.asarray(getattr(s, field), float),
+                                     shape) for s in states])
+
+
+@instrument.timed("loadcases.run_load_cases")
+def run_load_cases(data, states=None, section=None):
+    """ Returns the LoadCases of data for each state, with arrays of shape
+    (states,) + locations. governing is the index into names of the state
+    needing the largest cover height H_max at each location. State fields
+    may also be given per location.
+
+    States with no effective axial force need no download.
+    """
+    states = default_states(data) if states is None else list(states)
+    section = section_properties(data) if section is None else section
+    delta = max(data.deltas)
+    # State fields may vary by location too, so they set the shape as well
+    per_state = [getattr(s, field) for s in states
+                 for field in State._fields[1:]]
+    shape = np.broadcast_arrays(*section, *per_state, *(
+        data.P_e, data.T_a, data.v, data.E, data.alpha, data.g,
+        data.gamma_s, data.f, data.c))[0].shape
+
+    rho_cont = _stack(states, "rho_cont", shape)
+    delta_P = _stack(states, "P_i", shape) - data.P_e
+    delta_T = _stack(states, "T", shape) - data.T_a
+
+    w_o = section.w_empty + data.g * section.A_i * rho_cont
+    EAF = np.abs(general.effective_axial_force(
+        0, delta_P, section.A_i, data.v, section.A_s, data.E, data.alpha,
+        delta_T))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(EAF > 0, analytical.required_download(
+            delta, data.E, section.I, EAF, w_o), 0)
+    q = np.maximum(w - w_o, 0)
+    H = analytical.required_sand_cover_height(
+        q, section.D_tot, data.gamma_s, data.f, data.c)
+
+    H = np.asarray(H)
+    governing = np.argmax(H, axis=0)[()]
+    return LoadCases(
+        [s.name for s in states], EAF, w_o, w, q, H, governing,
+        np.max(H, axis=0)[()])
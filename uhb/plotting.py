@@ -0,0 +1,117 @@
+""" Plotting module
+
+Bulk rendering of spring curves, foundation profiles and design curves to
+image files. Figures are drawn with the non-interactive Agg canvas directly,
+bypassing pyplot's figure registry, and each thread reuses a single figure
+that is cleared between jobs. Jobs can be spread over a pool of worker
+processes.
+"""
+
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from uhb import instrument
+
+
+Job = namedtuple("Job", "kind path args")
+
+# Figures are not thread-safe, so each thread draws on its own
+_local = threading.local()
+
+
+def draw_spring(ax, disp, resistance, title="Soil Spring"):
+    """ Draws a bilinear soil spring, flat beyond the mobilisation
+    displacement.
+    """
+    ax.plot([0, disp, 3 * disp], [0, resistance, resistance], marker="o")
+    ax.set_title(title)
+    ax.set_xlabel("Displacement [m]")
+    ax.set_ylabel("Resistance [N/m]")
+    ax.grid()
+
+
+def draw_profile(ax, xs, w_fs, L_o):
+    """ Draws a foundation profile.
+    """
+    ax.plot(xs, w_fs, marker="o")
+    ax.set_title(f"Foundation Profile, L_o = {L_o:.2f} m")
+    ax.set_xlabel("x [m]")
+    ax.set_ylabel("Foundation Profile [m]")
+    ax.grid()
+
+
+def draw_curve(ax, x, ys, xlabel="", ylabel="", title=""):
+    """ Draws design curves given as a dictionary of label to y values.
+    """
+    for label, y in ys.items():
+        ax.plot(x, y, label=label)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend()
+    ax.grid()
+
+
+DRAWERS = {"spring": draw_spring, "profile": draw_profile, "curve": draw_curve}
+
+
+def _get_figure():
+    figure = getattr(_local, "figure", None)
+    if figure is None:
+        figure = _local.figure = Figure()
+        FigureCanvasAgg(figure)
+    return figure
+
+
+def close():
+    """ Releases the figure reused by this thread.
+    """
+    figure = getattr(_local, "figure", None)
+    if figure is not None:
+        figure.clear()
+        _local.figure = None
+
+
+@instrument.timed("plotting.render")
+def render(job):
+    """ Draws a job on the reused figure, saves it to job.path and returns
+    the path.
+    """
+    fig = _get_figure()
+    fig.clear()
+    ax = fig.add_subplot(111)
+    DRAWERS[job.kind](ax, *job.args)
+    fig.tight_layout()  # otherwise the right y-label is slightly clipped
+    fig.savefig(job.path)
+    fig.clear()
+    return job.path
+
+
+def _render_chunk(jobs):
+    try:
+        return [render(job) for job in jobs]
+    finally:
+        close()
+
+
+def render_many(jobs, processes=None, chunksize=16, plot=True):
+    """ Renders jobs and returns their paths.
+
+    :param processes: number of worker processes, None for one per CPU and
+        0 to render in this process
+    :param plot: False skips rendering altogether
+    """
+    if not plot:
+        return []
+    jobs = list(jobs)
+    if processes == 0:
+        return _render_chunk(jobs)
+
+    chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+    with ProcessPoolExecutor(processes) as pool:
+        return [path for paths in pool.map(_render_chunk, chunks)
+                for path in paths]
@@ -1,11 +1,10 @@
 """ Pipe-Soil Interaction module """
 
-from math import pi, sin, tan, exp, sqrt, radians
+from math import pi
 import numpy as np
-from scipy.interpolate import interp1d
 import matplotlib.pyplot as plt
 
-from uhb import general
+from uhb import general, instrument
 
 
 #########
@@ -13,8 +12,22 @@ from uhb import general
 #########
 
 
+def _where(condition, a, b):
+    """ Element-wise choice that returns scalars for scalar inputs.
+    """
+    return np.where(condition, a, b)[()]
+
+
+def _scalar(x):
+    """ Returns NumPy scalars as plain floats, leaving arrays and Duals.
+    """
+    if isinstance(x, (np.generic, np.ndarray)) and np.ndim(x) == 0:
+        return x.item()
+    return x
+
+
 def cot(a):
-    return 1 / tan(a)
+    return 1 / np.tan(a)
 
 
 def calculate_soil_weight(gamma, D, H):
@@ -33,25 +46,16 @@ def depth_to_centre(D_o, h):
 def Nch(c, H, D):
     """ Horizontal bearing capacity factor for sand
     """
-    if c == 0:
-        return 0
-
     x = H / D
 
-    return min(6.752 + 0.065 * x - 11.063 / (x + 1) ** 2 + 7.119 / (x + 1) ** 3, 9)
+    return _where(c == 0, 0, np.minimum(
+        6.752 + 0.065 * x - 11.063 / (x + 1) ** 2 + 7.119 / (x + 1) ** 3, 9))
 
 
+@instrument.timed("psi.Nqh")
 def Nqh(psi, H, D):
     """ Horizontal bearing capacity factor
     """
-    if psi == 0:
-        return 0
-
-    if psi < 20:
-        psi = 20
-    elif psi > 45:
-        psi = 45
-
     psi_range = [20, 25, 30, 35, 40, 45]
     a = [2.399, 3.332, 4.565, 6.816, 10.959, 17.658]
     b = [0.439, 0.839, 1.234, 2.019, 1.783, 3.309]
@@ -75,49 +79,47 @@ def Nqh(psi, H, D):
     x = H / D
 
     def par(case):
-        return interp1d(psi_range, case)(psi)
+        # psi is clamped to the range of the tabulated coefficients
+        return np.interp(psi, psi_range, case)
 
-    return (par(a) + par(b) * x + par(c) * x ** 2 + par(d) * x ** 3 + par(e) * x ** 4)
+    with instrument.stage("psi.Nqh.interp"):
+        return _where(psi == 0, 0, par(a) + par(b) * x + par(c) * x ** 2
+                      + par(d) * x ** 3 + par(e) * x ** 4)
 
 
 def Ncv(c, H, D):
     """ Vertical uplift factor for sand
     """
-    if c == 0:
-        return 0
-
-    return min(2 * H / D, 10)
+    return _where(c == 0, 0, np.minimum(2 * H / D, 10))
 
 
 def Nqv(psi, H, D):
     """ Vertical uplift factor for sand
     """
-    if psi == 0:
-        return 0
-
-    return min(psi * H / 44 / D, Nq(psi))
+    return _where(psi == 0, 0, np.minimum(psi * H / 44 / D, Nq(psi)))
 
 
 def Nc(psi, H, D):
     """ Soil bearing capacity factor
     """
     return (
-        cot(radians(psi + 0.001))
-        * (exp(pi * tan(radians(psi + 0.001)))
-            * tan(radians(45 + (psi + 0.001) / 2)) ** 2 - 1)
+        cot(np.radians(psi + 0.001))
+        * (np.exp(pi * np.tan(np.radians(psi + 0.001)))
+            * np.tan(np.radians(45 + (psi + 0.001) / 2)) ** 2 - 1)
     )
 
 
 def Nq(psi):
     """ Soil bearing capacity factor
     """
-    return exp(pi * tan(radians(psi))) * tan(radians(45 + psi / 2)) ** 2
+    return np.exp(pi * np.tan(np.radians(psi))) * np.tan(
+        np.radians(45 + psi / 2)) ** 2
 
 
 def Ngamma(psi):
     """ Soil bearing capacity factor
     """
-    return exp(0.18 * psi - 2.5)
+    return np.exp(0.18 * psi - 2.5)
 
 
 # AXIAL
@@ -132,17 +134,20 @@ def delta_t(soil_type):
         "stiff clay": 0.008,
         "soft clay": 0.01,
     }
-    return delta_ts.get(soil_type, ValueError("Unknown soil type."))
+    if soil_type not in delta_ts:
+        raise ValueError("Unknown soil type.")
+    return delta_ts[soil_type]
 
 
+@instrument.timed("psi.Tu")
 def Tu(D, H, c, f, psi, gamma):
     """ Maximum axial soil force per unit length
     """
     alpha = 0.608 - 0.123 * c - 0.274 / (c ** 2 + 1) + 0.695 / (c ** 3 + 1)
-    K0 = 1 - sin(radians(psi))
+    K0 = 1 - np.sin(np.radians(psi))
     return (
         pi * D * alpha * c + pi * D * H * gamma *
-        (1 + K0) / 2 * tan(radians(f * psi))
+        (1 + K0) / 2 * np.tan(np.radians(f * psi))
     )
 
 
@@ -152,9 +157,10 @@ def Tu(D, H, c, f, psi, gamma):
 def delta_p(H, D):
     """ Displacement at Pu
     """
-    return min(0.04 * (H + D / 2), 0.1 * D)
+    return np.minimum(0.04 * (H + D / 2), 0.1 * D)
 
 
+@instrument.timed("psi.Pu")
 def Pu(c, H, D, psi, gamma):
     """ Maximum lateral soil force per unit length
     """
@@ -168,15 +174,16 @@ def delta_qu(soil, H, D):
     """ Displacement at Qu
     """
     if "sand" in soil:
-        return min(0.01 * H, 0.1 * D)
+        return np.minimum(0.01 * H, 0.1 * D)
 
     elif "clay" in soil:
-        return min(0.1 * H, 0.2 * D)
+        return np.minimum(0.1 * H, 0.2 * D)
 
     else:
         raise ValueError("Unknown soil type.")
 
 
+@instrument.timed("psi.Qu")
 def Qu(psi, c, D, gamma, H):
     """ Vertical uplift soil resistance per unit length
     """
@@ -199,6 +206,7 @@ def delta_qd(soil, D):
         raise ValueError("Unknown soil type.")
 
 
+@instrument.timed("psi.Qd")
 def Qd(psi, c, D, gamma, H, rho_sw):
     """ Vertical bearing soil resistance per unit length
     """
@@ -213,7 +221,29 @@ def Qd(psi, c, D, gamma, H, rho_sw):
 ###############
 
 
-def F_uplift_d(soil_type, gamma, H, D):
+# Uplift resistance factors of loose, medium and dense sand and the friction
+# angles [deg] taken as representative of each
+F114_RESISTANCE_FACTORS = {
+    "loose sand": (30, 0.29),
+    "medium sand": (35, 0.47),
+    "dense sand": (40, 0.62),
+}
+
+
+def uplift_resistance_factor(psi_s):
+    """Returns the drained uplift resistance factor f interpolated linearly
+    from the friction angle, clamped to the loose and dense sand values.
+
+    DNVGL-RP-F114 - Section 5.2.2
+
+    :param psi_s: Soil friction angle [deg]
+    """
+    psis, fs = zip(*F114_RESISTANCE_FACTORS.values())
+    return np.interp(psi_s, psis, fs)
+
+
+@instrument.timed("psi.F_uplift_d")
+def F_uplift_d(soil_type, gamma, H, D, psi_s=None):
     """Returns drained uplift resistance.
 
     DNVGL-RP-F114 - Equation (5.6)
@@ -222,14 +252,13 @@ def F_uplift_d(soil_type, gamma, H, D):
     :param gamma: Submerged weight of soil [N/m^-3]
     :param H: Cover height (above pipe) [m]
     :param D: Outer pipe diameter [m]
+    :param psi_s: Soil friction angle [deg], if given f is interpolated from
+        it rather than looked up by soil type
     """
-    # TODO: interpolate f using psi_s
-    resistance_factors = {
-        "loose sand": 0.29,
-        "medium sand": 0.47,
-        "dense sand": 0.62,
-    }
-    f = resistance_factors[soil_type]
+    if psi_s is None:
+        f = F114_RESISTANCE_FACTORS[soil_type][1]
+    else:
+        f = uplift_resistance_factor(psi_s)
     return gamma * H * D + gamma * D ** 2 * (0.5 - pi / 8) + f * gamma * (
         H + 0.5 * D) ** 2
 
@@ -273,6 +302,7 @@ def P_otc6486(H, D, gamma, c):
 #     return Fd
 
 
+@instrument.timed("psi.gen_uplift_spring")
 def gen_uplift_spring(data, h, model="asce"):
     """ Returns vertical uplift soil spring as a tuple of displacement and 
     resistance based on chosen soil model.
@@ -280,15 +310,19 @@ def gen_uplift_spring(data, h, model="asce"):
     D_o = general.total_outside_diameter(data.D, data.t_coat)
     H = depth_to_centre(D_o, h)
     disp = delta_qu(data.soil_type, H, D_o)
+    # Only the chosen model is evaluated, F114 is undefined for clays
     springs = {
-        "asce": (disp, Qu(data.psi_s, data.c, D_o, data.gamma_s, H)),
-        "f114": (disp, F_uplift_d(data.soil_type, data.gamma_s, H, D_o)),
-        "f110": (disp, R_max(H, D_o, data.gamma_s, data.f)),
-        "otc": (disp, P_otc6486(H, D_o, data.gamma_s, data.c)),
+        "asce": lambda: Qu(data.psi_s, data.c, D_o, data.gamma_s, H),
+        "f114": lambda: F_uplift_d(data.soil_type, data.gamma_s, H, D_o),
+        "f110": lambda: R_max(H, D_o, data.gamma_s, data.f),
+        "otc": lambda: P_otc6486(H, D_o, data.gamma_s, data.c),
     }
-    return springs.get(model, ValueError("Unknown uplift soil model."))
+    if model not in springs:
+        raise ValueError("Unknown uplift soil model.")
+    return _scalar(disp), _scalar(springs[model]())
 
 
+@instrument.timed("psi.gen_bearing_spring")
 def gen_bearing_spring(data, h, model="asce"):
     """ Returns bearing soil spring as a tuple of displacement and resistance
     based on chosen soil model.
@@ -297,12 +331,15 @@ def gen_bearing_spring(data, h, model="asce"):
     H = depth_to_centre(D_o, h)
     disp = delta_qd(data.soil_type, D_o)
     springs = {
-        "asce": (disp,
-                 Qd(data.psi_s, data.c, D_o, data.gamma_s, H, data.rho_sw)),
+        "asce": lambda: Qd(data.psi_s, data.c, D_o, data.gamma_s, H,
+                           data.rho_sw),
     }
-    return springs.get(model, ValueError("Unknown bearing soil model."))
+    if model not in springs:
+        raise ValueError("Unknown bearing soil model.")
+    return _scalar(disp), _scalar(springs[model]())
 
 
+@instrument.timed("psi.gen_axial_spring")
 def gen_axial_spring(data, h, model="asce"):
     """ Returns axial soil spring as a tuple of displacement and resistance
     based on chosen soil model.
@@ -310,14 +347,15 @@ def gen_axial_spring(data, h, model="asce"):
     D_o = general.total_outside_diameter(data.D, data.t_coat)
     disp = delta_t(data.soil_type)
     springs = {
-        "asce": (disp,
-                 Tu(D_o, depth_to_centre(D_o, h), data.c, data.f, data.psi_s,
-                    data.gamma_s)
-                 ),
+        "asce": lambda: Tu(D_o, depth_to_centre(D_o, h), data.c, data.f,
+                           data.psi_s, data.gamma_s),
     }
-    return springs.get(model, ValueError("Unknown axial soil model."))
+    if model not in springs:
+        raise ValueError("Unknown axial soil model.")
+    return _scalar(disp), _scalar(springs[model]())
 
 
+@instrument.timed("psi.gen_lateral_spring")
 def gen_lateral_spring(data, h, model="asce"):
     """ Returns lateral soil spring as a tuple of displacement and resistance
     based on chosen soil model.
@@ -326,6 +364,8 @@ def gen_lateral_spring(data, h, model="asce"):
     H = depth_to_centre(D_o, h)
     disp = delta_p(H, D_o)
     springs = {
-        "asce": (disp, Pu(data.c, H, D_o, data.psi_s, data.gamma_s)),
+        "asce": lambda: Pu(data.c, H, D_o, data.psi_s, data.gamma_s),
     }
-    return springs.get(model, ValueError("Unknown lateral soil model."))
+    if model not in springs:
+        raise ValueError("Unknown lateral soil model.")
+    return _scalar(disp), _scalar(springs[model]())
@@ -1,7 +1,10 @@
 import numpy as np
 from math import log
 
+from uhb import instrument
 
+
+@instrument.timed("ramberg.ramberg_osgood")
 def ramberg_osgood(SMYS, ey, UTS, eu, E):
 
     alpha_ri = E * ey / SMYS - 1
@@ -13,6 +16,7 @@ def ramberg_osgood(SMYS, ey, UTS, eu, E):
     return [[e(s), s] for s in np.logspace(log(9 * SMYS / 10, 10), log(UTS, 10), num=7)]
 
 
+@instrument.timed("ramberg.nonlinear_rc")
 def nonlinear_rc(data):
     SMYS, SMYS_e = data.SMYS, data.SMYS_e
     SMTS, SMTS_e = data.SMTS, data.SMTS_e
@@ -0,0 +1,156 @@
+""" Reliability module
+
+First and second order reliability analysis (FORM/SORM) of the cover over a
+buried pipeline. The limit state is the uplift resistance of the installed
+cover less the uplift resistance required for stability, so failure is g < 0.
+
+All locations are solved together: means and standard deviations may be
+arrays over route locations and every iteration is a vectorised evaluation of
+the limit state with forward-mode gradients.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+from uhb import analytical, dual, psi
+
+
+RandomVariable = namedtuple("RandomVariable", "distribution mean std")
+
+FORM = namedtuple(
+    "FORM", "beta pf alpha design_point u converged iterations")
+
+SORM = namedtuple("SORM", "beta pf curvatures")
+
+
+def limit_state(data, H, model="f110"):
+    """ Returns the installed cover uplift resistance less the required uplift
+    resistance for cover height H [m].
+
+    :param model: "f110" for DNV-RP-F110 (sand) or OTC 6486 (clay, c > 0),
+        "asce" for the ALA vertical uplift resistance
+    """
+    download = analytical.stability_download(data)
+    if model == "f110":
+        R = analytical.cover_resistance(
+            H, download.D_tot, data.gamma_s, data.f, data.c)
+    elif model == "asce":
+        R = psi.Qu(data.psi_s, data.c, download.D_tot, data.gamma_s,
+                   psi.depth_to_centre(download.D_tot, H))
+    else:
+        raise ValueError("Unknown uplift soil model.")
+    return R - (download.w - download.w_o)
+
+
+def to_physical(variable, u):
+    """ Returns the physical value of a standard normal variate u.
+    """
+    if variable.distribution == "normal":
+        return variable.mean + variable.std * u
+    if variable.distribution == "lognormal":
+        zeta = np.sqrt(np.log(1 + (variable.std / variable.mean) ** 2))
+        lam = np.log(variable.mean) - zeta ** 2 / 2
+        return np.exp(lam + zeta * u)
+    raise ValueError("Unknown distribution.")
+
+
+def _gradient(data, H, variables, model, u):
+    """ Returns the limit state and its gradient in standard normal space.
+    """
+    names = list(variables)
+    seeded = dual.seed({name: u[i] for i, name in enumerate(names)})
+    x = {name: to_physical(variables[name], seeded[name]) for name in names}
+    g = limit_state(analytical.replace_inputs(data, x), H, model)
+    return dual.value(g), dual.derivatives(g, len(names))
+
+
+def form(data, H, variables, model="f110", tol=1e-6, maxiter=100):
+    """ Returns the FORM reliability index, failure probability, sensitivity
+    factors and design point for every location, found with the HL-RF
+    iteration.
+
+    :param data: deterministic inputs, fields may be arrays over locations
+    :param H: installed cover height [m]
+    :param dict variables: input name to RandomVariable
+    """
+    shape = np.broadcast(H, *(np.broadcast(v.mean, v.std)
+                              for v in variables.values())).shape
+    g0, _ = _gradient(data, H, variables, model,
+                      np.zeros((len(variables),) + shape))
+    shape = np.shape(g0)
+    u = np.zeros((len(variables),) + shape)
+    converged = np.zeros(shape, dtype=bool)
+    iterations = np.zeros(shape, dtype=int)
+
+    for _ in range(maxiter):
+        g, grad = _gradient(data, H, variables, model, u)
+        norm2 = np.sum(grad ** 2, axis=0)
+        u_new = (np.sum(grad * u, axis=0) - g) / norm2 * grad
+        step = np.sqrt(np.sum((u_new - u) ** 2, axis=0))
+        iterations += ~converged
+        converged = step < tol * np.maximum(1, np.sqrt(np.sum(u ** 2, axis=0)))
+        u = np.where(converged, u, u_new)
+        if converged.all():
+            break
+
+    g, grad = _gradient(data, H, variables, model, u)
+    alpha = -grad / np.sqrt(np.sum(grad ** 2, axis=0))
+    beta = np.sign(g0) * np.sqrt(np.sum(u ** 2, axis=0))
+    names = list(variables)
+    return FORM(
+        beta=beta,
+        pf=ndtr(-beta),
+        alpha=dict(zip(names, alpha)),
+        design_point={name: to_physical(variables[name], u[i])
+                      for i, name in enumerate(names)},
+        u=u,
+        converged=converged,
+        iterations=iterations,
+    )
+
+
+def sorm(data, H, variables, result, model="f110", step=1e-4):
+    """ Returns the SORM reliability index, failure probability (Breitung) and
+    principal curvatures at the FORM design point.
+
+    The Hessian in standard normal space is found by central differences of
+    the forward-mode gradient.
+    """
+    u = result.u
+    m = u.shape[0]
+    _, grad = _gradient(data, H, variables, model, u)
+    norm = np.sqrt(np.sum(grad ** 2, axis=0))
+
+    hessian = np.empty((m,) + u.shape)
+    for j in range(m):
+        du = np.zeros_like(u)
+        du[j] = step
+        _, grad_plus = _gradient(data, H, variables, model, u + du)
+        _, grad_minus = _gradient(data, H, variables, model, u - du)
+        hessian[j] = (grad_plus - grad_minus) / (2 * step)
+
+    # Move the variable axes last to solve all locations as stacks of matrices
+    hessian = np.moveaxis(hessian, (0, 1), (-2, -1))
+    hessian = (hessian + np.swapaxes(hessian, -1, -2)) / 2
+    alpha = np.moveaxis(-grad / norm, 0, -1)
+
+    # Householder reflection swapping the first axis with alpha, its other
+    # columns span the tangent plane of the limit state at the design point
+    v = alpha.copy()
+    v[..., 0] -= 1
+    vv = np.sum(v ** 2, axis=-1)[..., np.newaxis, np.newaxis]
+    outer = v[..., :, np.newaxis] * v[..., np.newaxis, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        reflection = np.eye(m) - np.where(vv > 1e-12, 2 * outer / vv, 0)
+    tangent = reflection[..., :, 1:]
+    reduced = np.swapaxes(tangent, -1, -2) @ hessian @ tangent
+    curvatures = np.linalg.eigvalsh(reduced) / norm[..., np.newaxis]
+
+    beta = result.beta
+    factors = 1 + beta[..., np.newaxis] * curvatures
+    with np.errstate(invalid="ignore"):
+        pf = ndtr(-beta) * np.prod(
+            np.where(factors > 0, factors, np.nan) ** -0.5, axis=-1)
+    return SORM(beta=-ndtri(pf), pf=pf, curvatures=curvatures)
@@ -0,0 +1,146 @@
+""" Route module
+
+Element level state for a whole route in one packed NumPy structured array:
+kilometre point, cover height, soil zone, the four soil springs and the
+utilisation of the cover. The pipe properties and required cover height
+depend only on the zone, so they are kept once per zone in a zone table that
+table[route["zone"]] spreads over the elements. At 49 bytes per element a
+10^7 element route takes 490 MB, and each field is a strided view that the
+vectorised kernels accept directly. Routes can be created as or saved to
+.npy files and memory mapped back, so they need not fit in memory.
+"""
+
+import numpy as np
+
+from uhb import analytical, instrument, psi
+
+
+DIRECTIONS = ("axial", "lateral", "uplift", "bearing")
+
+GENERATORS = {
+    "axial": psi.gen_axial_spring,
+    "lateral": psi.gen_lateral_spring,
+    "uplift": psi.gen_uplift_spring,
+    "bearing": psi.gen_bearing_spring,
+}
+
+DTYPE = np.dtype(
+    [("KP", "<f8"), ("cover", "<f4"), ("zone", "u1")]
+    + [(f"{direction}_{field}", "<f4") for direction in DIRECTIONS
+       for field in ("disp", "resistance")]
+    + [("utilisation", "<f4")]
+)
+
+ZONE_DTYPE = np.dtype(
+    [("D_tot", "<f8"), ("w_o", "<f8"), ("EAF", "<f8"), ("H", "<f8")])
+
+# Zone ids index the zone table, so they fit the one byte zone field
+MAX_ZONE = np.iinfo(DTYPE["zone"]).max
+
+
+def empty(n):
+    """ Returns a route of n elements with every field zero.
+    """
+    return np.zeros(n, dtype=DTYPE)
+
+
+def create(path, n):
+    """ Returns a route of n elements memory mapped to a new .npy file.
+    """
+    return np.lib.format.open_memmap(path, mode="w+", dtype=DTYPE, shape=(n,))
+
+
+def from_arrays(KP, cover, zone=0, path=None):
+    """ Returns a route of the given KP [m], cover heights [m] and zone ids,
+    memory mapped to a new .npy file at path when given.
+    """
+    KP, cover, zone = np.broadcast_arrays(KP, cover, zone)
+    if np.any((zone < 0) | (zone > MAX_ZONE)):
+        raise ValueError(f"Zone ids must be from 0 to {MAX_ZONE}.")
+    route = empty(len(KP)) if path is None else create(path, len(KP))
+    route["KP"], route["cover"], route["zone"] = KP, cover, zone
+    return route
+
+
+def load(path, mode="r"):
+    """ Returns the route of a .npy file memory mapped with mode "r" or
+    "r+".
+    """
+    route = np.lib.format.open_memmap(path, mode=mode)
+    if route.dtype != DTYPE:
+        raise ValueError(f"{path} is not a route.")
+    return route
+
+
+def save(path, route):
+    """ Writes a route to a .npy file.
+    """
+    np.save(path, np.asarray(route, dtype=DTYPE))
+
+
+def spring(route, direction):
+    """ Returns views of the displacement and resistance of a spring.
+    """
+    return route[f"{direction}_disp"], route[f"{direction}_resistance"]
+
+
+def zone_table(zones):
+    """ Returns the pipe properties and required cover height of each zone
+    as a ZONE_DTYPE array indexed by zone id, nan for ids not in zones.
+
+    :param dict zones: zone id to data namedtuple
+    """
+    table = np.full(max(zones, default=-1) + 1, np.nan, dtype=ZONE_DTYPE)
+    for zone, data in zones.items():
+        results = analytical.run_analytical_calc(data)
+        table[zone] = (analytical.stability_download(data).D_tot,
+                       results.w_o, results.EAF, results.H)
+    return table
+
+
+@instrument.timed("route.evaluate")
+def evaluate(route, zones, models=None, chunk_size=10 ** 6):
+    """ Fills the spring and utilisation fields of a route in place from its
+    cover and zone fields, in chunks of chunk_size elements so memory mapped
+    routes are processed without loading them whole.
+
+    Utilisation is the required cover height of the zone over the cover. At
+    zero cover it is infinite where cover is required and zero where it is
+    not, and it is nan where the required cover height could not be solved.
+    Raises ValueError, before filling anything, if the route holds a zone id
+    missing from zones.
+
+    :param dict zones: zone id to data namedtuple
+    :param dict models: spring models by direction, ASCE by default
+    """
+    models = models or {}
+    ids = set()
+    for start in range(0, len(route), chunk_size):
+        ids.update(np.unique(route["zone"][start:start + chunk_size]).tolist())
+    unknown = ids - set(zones)
+    if unknown:
+        raise ValueError(f"No data for route zones {sorted(unknown)}.")
+
+    table = zone_table(zones)
+
+    for start in range(0, len(route), chunk_size):
+        chunk = route[start:start + chunk_size]
+        for zone, data in zones.items():
+            mask = chunk["zone"] == zone
+            if not mask.any():
+                continue
+            cover = chunk["cover"][mask].astype(float)
+            H = table["H"][zone]
+            values = {}
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values["utilisation"] = 0 if H == 0 else H / cover
+            for direction in DIRECTIONS:
+                disp, resistance = GENERATORS[direction](
+                    data, cover, models.get(direction, "asce"))
+                values[f"{direction}_disp"] = disp
+                values[f"{direction}_resistance"] = resistance
+            for field, value in values.items():
+                chunk[field][mask] = value
+    if isinstance(route, np.memmap):
+        route.flush()
+    return route
@@ -0,0 +1,126 @@
+""" Soil stiffness table module
+
+Axial, lateral, vertical uplift and vertical bearing spring resistances,
+mobilisation displacements and secant stiffnesses for a set of soil types and
+a grid of cover heights. Each soil is evaluated in vectorised blocks of cover
+heights and written out as it goes, so memory is bounded by the block size.
+"""
+
+import csv
+import json
+
+import numpy as np
+
+from uhb import psi
+
+
+# Resistance, displacement and stiffness fields per spring direction
+DIRECTIONS = {
+    "axial": ("T_u", "delta_t", "K_a"),
+    "lateral": ("P_u", "delta_p", "K_l"),
+    "uplift": ("Q_u", "delta_qu", "K_vu"),
+    "bearing": ("Q_d", "delta_qd", "K_vb"),
+}
+
+FIELDS = tuple(field for fields in DIRECTIONS.values() for field in fields)
+
+GENERATORS = {
+    "axial": psi.gen_axial_spring,
+    "lateral": psi.gen_lateral_spring,
+    "uplift": psi.gen_uplift_spring,
+    "bearing": psi.gen_bearing_spring,
+}
+
+
+def cover_heights(start, stop, step):
+    """ Returns the cover heights from start to stop inclusive, rounded to
+    the decimals of start and step so that e.g. 0.1 + 2 * 0.1 is 0.3.
+    """
+    decimals = max(
+        len(np.format_float_positional(float(x)).partition(".")[2])
+        for x in (start, step))
+    n = int(round((stop - start) / step)) + 1
+    return np.round(start + step * np.arange(n), decimals)
+
+
+def soil_stiffnesses(data, h, models=None):
+    """ Returns a dictionary of spring resistances, displacements and
+    stiffnesses for cover heights h [m].
+
+    :param dict models: spring models by direction ("uplift", "bearing",
+        "axial", "lateral"), ASCE by default
+    """
+    models = models or {}
+    shape = np.shape(h)
+    table = {}
+    for direction, (R, disp, K) in DIRECTIONS.items():
+        spring_disp, resistance = GENERATORS[direction](
+            data, h, models.get(direction, "asce"))
+        table[R] = np.broadcast_to(resistance, shape)
+        table[disp] = np.broadcast_to(spring_disp, shape)
+        table[K] = table[R] / table[disp]
+    return table
+
+
+def iter_table(soils, heights, chunk_size=10000, models=None):
+    """ Yields (soil_type, h, table) blocks of at most chunk_size cover
+    heights.
+
+    :param dict soils: soil type to data namedtuple
+    """
+    heights = np.asarray(heights, dtype=float)
+    for soil_type, data in soils.items():
+        for start in range(0, len(heights), chunk_size):
+            h = heights[start:start + chunk_size]
+            yield soil_type, h, soil_stiffnesses(data, h, models)
+
+
+def write_json(outfile, blocks):
+    """ Streams blocks as {soil_type: {cover height: {field: value}}}.
+    """
+    outfile.write("{")
+    current = None
+    for soil_type, h, table in blocks:
+        if soil_type != current:
+            if current is not None:
+                outfile.write("\n    },")
+            outfile.write(f"\n    {json.dumps(soil_type)}: {{")
+            current, first = soil_type, True
+        for i, height in enumerate(h):
+            row = {field: float(table[field][i]) for field in FIELDS}
+            outfile.write(("" if first else ",") + f"\n        "
+                          f"\"{float(height)!r}\": {json.dumps(row)}")
+            first = False
+    if current is not None:
+        outfile.write("\n    }")
+    outfile.write("\n}\n")
+
+
+def write_csv(outfile, blocks):
+    """ Streams blocks as CSV rows of soil type, cover height and fields.
+    """
+    writer = csv.writer(outfile)
+    writer.writerow(("soil_type", "h") + FIELDS)
+    for soil_type, h, table in blocks:
+        columns = [h] + [table[field] for field in FIELDS]
+        writer.writerows(
+            (soil_type,) + tuple(row) for row in zip(*columns))
+
+
+def write_npy(path, blocks, rows):
+    """ Streams blocks into a .npy structured array of the given total rows.
+    Soil type names are stored in 32 characters.
+    """
+    dtype = [("soil_type", "<U32"), ("h", "<f8")] + [
+        (field, "<f8") for field in FIELDS]
+    array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype,
+                                      shape=(rows,))
+    start = 0
+    for soil_type, h, table in blocks:
+        block = array[start:start + len(h)]
+        block["soil_type"] = soil_type
+        block["h"] = h
+        for field in FIELDS:
+            block[field] = table[field]
+        start += len(h)
+    array.flush()
@@ -0,0 +1,237 @@
+""" Results store module
+
+An append-only columnar store for large sweeps. Each chunk is a directory
+holding one .npy file per column. index.json lists the chunks with their
+directory, row count and, per column, the min/max of numeric columns and the
+distinct values of string columns. Queries use the index to skip chunks that
+cannot match and memory map the columns of the rest, so only the matching
+rows are loaded.
+
+A store has a single writer; the index is replaced atomically so readers
+never see a partially written chunk. A replaced chunk is written to a fresh
+directory and the old one is removed only once the index points at the new
+one.
+"""
+
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+
+INDEX = "index.json"
+MAX_DISTINCT = 100
+
+OPERATORS = {
+    "==": np.equal,
+    "!=": np.not_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+
+
+def case_columns(data, results):
+    """ Returns a dictionary of the scalar and array inputs in data and the
+    fields of a results namedtuple, e.g. from run_analytical_calc.
+    """
+    columns = {
+        name: value for name, value in data._asdict().items()
+        if isinstance(value, (int, float, str, np.ndarray, np.generic))
+    }
+    columns.update(results._asdict())
+    return columns
+
+
+def _arrays(columns):
+    """ Returns the columns as contiguous 1D arrays of equal length.
+    """
+    if hasattr(columns, "_asdict"):
+        columns = columns._asdict()
+    arrays = [np.asarray(value) for value in columns.values()]
+    n = max((a.size for a in arrays), default=0)
+    return {
+        name: np.ascontiguousarray(np.broadcast_to(a.ravel() if a.ndim else a,
+                                                   (n,)))
+        for name, a in zip(columns, arrays)
+    }
+
+
+def _stats(array):
+    if array.dtype.kind in "US":
+        distinct = np.unique(array)
+        return {
+            "dtype": array.dtype.str,
+            "values": distinct.tolist() if len(distinct) <= MAX_DISTINCT
+            else None,
+        }
+    if array.dtype.kind in "biuf" and array.size:
+        return {
+            "dtype": array.dtype.str,
+            "min": np.nanmin(array).item(),
+            "max": np.nanmax(array).item(),
+        }
+    return {"dtype": array.dtype.str}
+
+
+def load_index(path):
+    """ Returns the index of the store at path, empty if it does not exist.
+    """
+    try:
+        with open(os.path.join(path, INDEX), "r") as infile:
+            return json.load(infile)
+    except FileNotFoundError:
+        return {"chunks": [], "next": 0}
+
+
+def write_index(path, index):
+    """ Replaces the index of the store at path atomically.
+    """
+    temp = os.path.join(path, INDEX + ".tmp")
+    with open(temp, "w") as outfile:
+        json.dump(index, outfile, indent=1)
+    os.replace(temp, os.path.join(path, INDEX))
+
+
+def append(path, columns, name=None, replace=False, index=None):
+    """ Writes the columns (a dict or namedtuple of equal length arrays or
+    scalars) as a new chunk and returns its name. Unnamed chunks are numbered
+    from a counter kept in the index. Writing a chunk with an existing name
+    raises ValueError unless replace is True.
+
+    Each call rewrites the whole index. To add many chunks, pass an index
+    from load_index instead: the chunk is then only added to it in memory
+    and is not part of the store until write_index is called with it.
+    Chunks cannot be replaced this way.
+    """
+    os.makedirs(path, exist_ok=True)
+    batch = index is not None
+    index = load_index(path) if index is None else index
+    names = {c["name"] for c in index["chunks"]}
+    counter = index.get("next", len(index["chunks"]))
+    if name is None:
+        while f"chunk_{counter:06d}" in names:
+            counter += 1
+        name, counter = f"chunk_{counter:06d}", counter + 1
+    elif name in names and not replace:
+        raise ValueError(f"Chunk {name} already exists in {path}.")
+    elif name in names and batch:
+        raise ValueError("Chunks cannot be replaced in a held index.")
+
+    # A fresh directory, so a replaced chunk stays readable until the index
+    # is swapped and no columns of the old chunk are left behind. A directory
+    # the index does not list is left from an interrupted batch and reused.
+    directory = name
+    if name not in names:
+        shutil.rmtree(os.path.join(path, directory), ignore_errors=True)
+    elif os.path.exists(os.path.join(path, directory)):
+        directory = f"{name}.{uuid.uuid4().hex[:8]}"
+    arrays = _arrays(columns)
+    chunk = os.path.join(path, directory)
+    os.makedirs(chunk)
+    for column, array in arrays.items():
+        np.save(os.path.join(chunk, column + ".npy"), array)
+
+    entry = {
+        "name": name,
+        "dir": directory,
+        "rows": len(next(iter(arrays.values()), ())),
+        "columns": {column: _stats(a) for column, a in arrays.items()},
+    }
+    old = [c for c in index["chunks"] if c["name"] == name]
+    index["chunks"] = [c for c in index["chunks"] if c["name"] != name]
+    index["chunks"].append(entry)
+    index["next"] = counter
+    if batch:
+        return name
+    write_index(path, index)
+    for c in old:
+        shutil.rmtree(os.path.join(path, c.get("dir", c["name"])),
+                      ignore_errors=True)
+    return name
+
+
+def _condition(condition):
+    if isinstance(condition, tuple):
+        return condition
+    return "==", condition
+
+
+def _may_match(entry, conditions):
+    """ Returns False if the chunk index rules out any row matching.
+    """
+    for column, condition in conditions.items():
+        stats = entry["columns"].get(column)
+        if stats is None:
+            return False
+        op, value = _condition(condition)
+        if stats.get("values") is not None:
+            if not any(OPERATORS[op](v, value) for v in stats["values"]):
+                return False
+        elif "min" in stats:
+            low, high = stats["min"], stats["max"]
+            if not {
+                "==": low <= value <= high,
+                "!=": not low == high == value,
+                ">": high > value,
+                ">=": high >= value,
+                "<": low < value,
+                "<=": low <= value,
+            }[op]:
+                return False
+    return True
+
+
+def _open_entry(path, entry, columns=None):
+    chunk = os.path.join(path, entry.get("dir", entry["name"]))
+    if columns is None:
+        columns = list(entry["columns"])
+    return {
+        column: np.load(os.path.join(chunk, column + ".npy"), mmap_mode="r")
+        for column in columns
+    }
+
+
+def open_chunk(path, name, columns=None):
+    """ Returns a dictionary of memory mapped columns of a chunk, all the
+    columns recorded in the index by default.
+    """
+    for entry in load_index(path)["chunks"]:
+        if entry["name"] == name:
+            return _open_entry(path, entry, columns)
+    raise KeyError(f"No chunk {name} in {path}.")
+
+
+def iter_query(path, columns=None, **conditions):
+    """ Yields the matching rows of each chunk as a dictionary of arrays.
+
+    Conditions are column=value for equality or column=(op, value) with op
+    one of ==, !=, >, >=, < and <=, e.g. D=(">", 0.3).
+    """
+    for entry in load_index(path)["chunks"]:
+        if not _may_match(entry, conditions):
+            continue
+        mapped = _open_entry(path, entry, columns)
+        mask = np.ones(entry["rows"], dtype=bool)
+        for column, condition in conditions.items():
+            op, value = _condition(condition)
+            values = mapped[column] if column in mapped else _open_entry(
+                path, entry, [column])[column]
+            mask &= OPERATORS[op](values, value)
+        if mask.any():
+            yield {column: np.asarray(values[mask])
+                   for column, values in mapped.items()}
+
+
+def query(path, columns=None, **conditions):
+    """ Returns the matching rows of the whole store as a dictionary of
+    arrays, see iter_query.
+    """
+    parts = list(iter_query(path, columns, **conditions))
+    if not parts:
+        return {}
+    return {column: np.concatenate([p[column] for p in parts])
+            for column in parts[0]}
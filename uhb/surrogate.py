@@ -0,0 +1,175 @@
+""" Surrogate module
+
+Precomputed soil resistance surfaces for route-scale work. A surface tabulates
+an exact psi kernel for one soil and pipe diameter on a grid over friction
+angle psi [deg] and depth ratio H/D, refining the grid until the interpolation
+error inside the cells is within a relative tolerance of the exact kernel.
+Queries are answered by vectorised bilinear or bicubic interpolation, and
+points outside the table fall back to the exact kernel.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+from scipy.interpolate import RectBivariateSpline
+
+from uhb import instrument, psi
+
+
+Surface = namedtuple("Surface", "kernel params psi x values error spline")
+
+DEGREES = {"linear": 1, "cubic": 3}
+
+# Positions within each grid cell, per direction, where the error is checked
+VALIDATION = (0.125, 0.25, 0.375, 0.5, 0.625, 0.75, 0.875)
+
+# Fraction of the tolerance the validation error must be within, as a margin
+# for points between the validation points
+SAFETY = 0.9
+
+
+def _Qd(psi_s, H, p):
+    return psi.Qd(psi_s, p["c"], p["D"], p["gamma"], H, p["rho_sw"])
+
+
+def _Pu(psi_s, H, p):
+    return psi.Pu(p["c"], H, p["D"], psi_s, p["gamma"])
+
+
+def _F_uplift_d(psi_s, H, p):
+    return psi.F_uplift_d(None, p["gamma"], H, p["D"], psi_s)
+
+
+KERNELS = {"Qd": _Qd, "Pu": _Pu, "F_uplift_d": _F_uplift_d}
+
+
+def soil_params(data):
+    """ Returns the soil and pipe parameters a surface is tabulated for.
+    """
+    return {
+        "gamma": float(data.gamma_s),
+        "c": float(data.c),
+        "rho_sw": float(data.rho_sw),
+        "D": float(data.D + 2 * data.t_coat),
+    }
+
+
+def exact(kernel, params, psi_s, H):
+    """ Returns the exact kernel resistance [N/m].
+    """
+    return KERNELS[kernel](psi_s, H, params)
+
+
+def _spline(psis, xs, values, method):
+    if method == "linear":
+        return None
+    k = DEGREES[method]
+    return RectBivariateSpline(psis, xs, values, kx=k, ky=k, s=0)
+
+
+def _cell(grid, x):
+    """ Returns the cell index and fractional position of x on a uniform grid.
+    """
+    position = (x - grid[0]) / (grid[1] - grid[0])
+    i = np.clip(np.floor(position).astype(int), 0, len(grid) - 2)
+    return i, position - i
+
+
+def _interpolate(psis, xs, values, spline, psi_s, x):
+    if spline is not None:
+        return spline.ev(psi_s, x)
+    i, t = _cell(psis, psi_s)
+    j, u = _cell(xs, x)
+    return ((1 - t) * ((1 - u) * values[i, j] + u * values[i, j + 1])
+            + t * ((1 - u) * values[i + 1, j] + u * values[i + 1, j + 1]))
+
+
+def _validation(grid, fractions=VALIDATION):
+    """ Returns points at the given fractions of every cell of a grid.
+    """
+    return (grid[:-1, np.newaxis]
+            + np.asarray(fractions) * np.diff(grid)[:, np.newaxis]).ravel()
+
+
+def _cache_path(cache_dir, key):
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode())
+    return os.path.join(cache_dir, f"surface_{digest.hexdigest()}.npz")
+
+
+@instrument.timed("surrogate.build")
+def build(kernel, data, psi_range=(20, 45), x_range=(0.5, 20), tol=1e-3,
+          method="linear", shape=(11, 21), max_points=10 ** 6,
+          cache_dir=None):
+    """ Returns a Surface of the kernel ("Qd", "Pu" or "F_uplift_d") over
+    psi_range [deg] and x_range of H/D.
+
+    The grid starts at shape and is doubled in each direction until the
+    maximum relative error, checked at a 7 x 7 set of points inside every
+    cell, is within SAFETY times tol. Surfaces are
+    cached as .npz files in cache_dir when given.
+    """
+    params = soil_params(data)
+    key = {
+        "kernel": kernel, "params": params, "psi_range": list(psi_range),
+        "x_range": list(x_range), "tol": tol, "method": method,
+    }
+    path = _cache_path(cache_dir, key) if cache_dir else None
+    if path and os.path.exists(path):
+        with np.load(path) as cached:
+            psis, xs = cached["psi"], cached["x"]
+            values, error = cached["values"], float(cached["error"])
+        return Surface(kernel, params, psis, xs, values, error,
+                       _spline(psis, xs, values, method))
+
+    n_psi, n_x = shape
+    while True:
+        if n_psi * n_x > max_points:
+            raise ValueError(
+                f"Surrogate for {kernel} exceeds {max_points} points before "
+                f"reaching a relative error of {tol}.")
+        psis = np.linspace(*psi_range, n_psi)
+        xs = np.linspace(*x_range, n_x)
+        values = exact(kernel, params, psis[:, np.newaxis],
+                       xs[np.newaxis, :] * params["D"])
+        spline = _spline(psis, xs, values, method)
+
+        psi_check = _validation(psis)[:, np.newaxis]
+        x_check = _validation(xs)[np.newaxis, :]
+        reference = exact(kernel, params, psi_check, x_check * params["D"])
+        approx = _interpolate(psis, xs, values, spline, psi_check, x_check)
+        error = np.max(np.abs(approx - reference)
+                       / np.maximum(np.abs(reference), 1e-12))
+        if error <= SAFETY * tol:
+            break
+        n_psi, n_x = 2 * n_psi - 1, 2 * n_x - 1
+
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Unique per writer so concurrent builds of one surface do not clash
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp, "wb") as outfile:
+            np.savez(outfile, psi=psis, x=xs, values=values, error=error)
+        os.replace(temp, path)
+
+    return Surface(kernel, params, psis, xs, values, error, spline)
+
+
+def evaluate(surface, psi_s, H):
+    """ Returns the interpolated resistance [N/m] at friction angle psi_s
+    [deg] and depth H [m], using the exact kernel outside the table.
+    """
+    psi_s, H = np.broadcast_arrays(np.asarray(psi_s, dtype=float),
+                                   np.asarray(H, dtype=float))
+    x = H / surface.params["D"]
+    inside = ((psi_s >= surface.psi[0]) & (psi_s <= surface.psi[-1])
+              & (x >= surface.x[0]) & (x <= surface.x[-1]))
+    result = _interpolate(surface.psi, surface.x, surface.values,
+                          surface.spline, psi_s, x)
+    if not inside.all():
+        result = np.where(inside, result, exact(
+            surface.kernel, surface.params, psi_s, H))
+    return result[()]
@@ -0,0 +1,188 @@
+""" Sweep module
+
+Chunked, resumable sweeps over a grid of inputs. The grid is the cartesian
+product of named value arrays; its cases are numbered in C order and split
+into chunks of chunk_size consecutive cases, so chunk i always holds the same
+cases. Each chunk is evaluated in one vectorised call and appended to a
+results store as chunk_<i>. The store index is the checkpoint: it only lists
+fully written chunks, so a sweep that is stopped at any point resumes by
+skipping the chunks already in the index. The manifest records the grid,
+kernel, chunk size and base inputs, and a sweep only resumes with the same
+ones, so a store never mixes cases of different inputs.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from uhb import analytical, instrument, stiffness, store
+
+
+MANIFEST = "sweep.json"
+
+
+def _analytical(data, h):
+    return analytical.run_analytical_calc(data)._asdict()
+
+
+def _springs(data, h):
+    return stiffness.soil_stiffnesses(data, h)
+
+
+# Kernels evaluate a data namedtuple of case arrays and cover heights h
+KERNELS = {"analytical": _analytical, "springs": _springs}
+
+# Kernels evaluated at cover heights, which need "h" in the grid; the others
+# solve for the cover height and take no "h"
+COVER_KERNELS = {"springs"}
+
+
+def chunk_name(chunk_id):
+    return f"chunk_{chunk_id:06d}"
+
+
+def grid_size(grid):
+    """ Returns the number of cases in the grid.
+    """
+    return int(np.prod([len(values) for values in grid.values()]))
+
+
+def n_chunks(grid, chunk_size):
+    return -(-grid_size(grid) // chunk_size)
+
+
+def chunk_cases(grid, chunk_id, chunk_size):
+    """ Returns the case numbers and a dictionary of input arrays of a chunk.
+    """
+    start = chunk_id * chunk_size
+    cases = np.arange(start, min(start + chunk_size, grid_size(grid)))
+    shape = [len(values) for values in grid.values()]
+    indices = np.unravel_index(cases, shape)
+    return cases, {
+        name: np.asarray(values)[i]
+        for (name, values), i in zip(grid.items(), indices)
+    }
+
+
+def check_grid(data, grid, kernel):
+    """ Raises ValueError if the grid cannot be evaluated by the kernel.
+    """
+    if kernel not in KERNELS:
+        raise ValueError(f"Unknown sweep kernel {kernel!r}.")
+    if kernel in COVER_KERNELS and "h" not in grid:
+        raise ValueError(f"The {kernel} kernel needs cover heights h.")
+    if kernel not in COVER_KERNELS and "h" in grid:
+        raise ValueError(
+            f"The {kernel} kernel solves for the cover height, so h cannot "
+            f"be swept.")
+    unknown = set(grid) - {"h", "delta"} - set(data._fields)
+    if unknown:
+        raise ValueError(f"Unknown sweep inputs {sorted(unknown)}.")
+    empty = [name for name, values in grid.items()
+             if np.ndim(values) != 1 or not len(values)]
+    if empty:
+        raise ValueError(f"Sweep inputs {empty} need one or more values.")
+
+
+def _manifest(data, grid, kernel, chunk_size):
+    manifest = {
+        "kernel": kernel,
+        "chunk_size": chunk_size,
+        "grid": grid,
+        "data": data._asdict(),
+    }
+    # As read back from the file, so that manifests compare like for like
+    return json.loads(json.dumps(
+        manifest, default=lambda value: np.asarray(value).tolist()))
+
+
+def _check_manifest(path, manifest):
+    """ Writes the sweep manifest, or checks that it matches the existing
+    one, since resuming with a different grid or chunk size would mix cases.
+    """
+    manifest_path = os.path.join(path, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r") as infile:
+            if json.load(infile) != manifest:
+                raise ValueError(
+                    f"{path} holds a sweep with a different grid, kernel, "
+                    f"chunk size or inputs.")
+        return
+    os.makedirs(path, exist_ok=True)
+    temp = manifest_path + ".tmp"
+    with open(temp, "w") as outfile:
+        json.dump(manifest, outfile)
+    os.replace(temp, manifest_path)
+
+
+def completed(path):
+    """ Returns the set of chunk names already written to the store.
+    """
+    return {chunk["name"] for chunk in store.load_index(path)["chunks"]}
+
+
+def run(path, data, grid, kernel="analytical", chunk_size=100000,
+        max_chunks=None, progress=None, checkpoint=100):
+    """ Evaluates the kernel ("analytical" or "springs") over the grid,
+    writing results to the store at path, and returns the number of chunks
+    evaluated by this call. Chunks already in the store are skipped. The
+    grid is checked against the kernel, see check_grid, before anything is
+    written.
+
+    :param dict grid: input name to array of values, "h" for cover heights
+    :param max_chunks: stop after evaluating this many chunks
+    :param progress: called with (chunk_id, total chunks) after each chunk
+    :param checkpoint: write the store index every this many chunks, as well
+        as when the run stops
+    """
+    grid = {name: np.asarray(values) for name, values in grid.items()}
+    check_grid(data, grid, kernel)
+    _check_manifest(path, _manifest(data, grid, kernel, chunk_size))
+
+    # The index is held and written in batches, since rewriting it for every
+    # chunk costs time quadratic in the number of chunks
+    index = store.load_index(path)
+    done = {chunk["name"] for chunk in index["chunks"]}
+    total, evaluated = n_chunks(grid, chunk_size), 0
+    try:
+        for chunk_id in range(total):
+            if chunk_name(chunk_id) in done:
+                continue
+            if max_chunks is not None and evaluated >= max_chunks:
+                break
+            with instrument.stage("sweep.chunk"):
+                cases, inputs = chunk_cases(grid, chunk_id, chunk_size)
+                h = inputs.pop("h", None)
+                case_data = analytical.replace_inputs(data, inputs)
+                results = KERNELS[kernel](case_data, h)
+
+                columns = {"case": cases}
+                if h is not None:
+                    columns["h"] = h
+                columns.update(inputs)
+                columns.update(results)
+                store.append(path, columns, chunk_name(chunk_id),
+                             index=index)
+            evaluated += 1
+            if evaluated % checkpoint == 0:
+                store.write_index(path, index)
+            if progress:
+                progress(chunk_id, total)
+    finally:
+        if evaluated % checkpoint:
+            store.write_index(path, index)
+    return evaluated
+
+
+def results(path, columns=None, **conditions):
+    """ Returns the results of a sweep ordered by case number, see
+    store.query.
+    """
+    if columns is not None and "case" not in columns:
+        columns = ["case"] + list(columns)
+    table = store.query(path, columns, **conditions)
+    if not table:
+        return table
+    order = np.argsort(table["case"], kind="stable")
+    return {column: values[order] for column, values in table.items()}